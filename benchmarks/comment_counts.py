@@ -0,0 +1,124 @@
+"""Time to read one feed page with its comment counts, per strategy.
+
+* ``annotate`` – Count('comments') on the feed query, aggregated over
+  every candidate row before LIMIT;
+* ``column`` – the Post.comment_count column kept up to date by signals;
+* ``prefetch`` – the page first, then one GROUP BY over its post ids
+  (BLOG_COMMENT_COUNTS = 'prefetch').
+
+    python benchmarks/comment_counts.py --posts 100000 --comments 1000000
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / 'blogicum'
+BATCH_SIZE = 10000
+
+
+def setup_django(database):
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
+    os.environ['DB_ENGINE'] = 'sqlite'
+    os.environ['DB_NAME'] = database
+    # Keep the bench rows out of the site's shared cache.
+    os.environ['CACHE_BACKEND'] = 'locmem'
+    import django
+
+    django.setup()
+
+
+def in_batches(objects):
+    batch = []
+    for obj in objects:
+        batch.append(obj)
+        if len(batch) == BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def seed(posts, comments):
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+    from django.utils import timezone
+
+    from blog.models import Category, Comment, Post
+    from blog.service import recount_comments
+
+    call_command('migrate', verbosity=0)
+    author = get_user_model().objects.create(username='bench')
+    category = Category.objects.create(
+        title='Бенчмарк', description='-', slug='bench'
+    )
+    now = timezone.now()
+    for batch in in_batches(
+        Post(title=f'Пост {number}', text='Текст', pub_date=now,
+             author=author, category=category)
+        for number in range(posts)
+    ):
+        Post.objects.bulk_create(batch)
+    post_ids = list(Post.objects.values_list('pk', flat=True))
+    for batch in in_batches(
+        Comment(text='Комментарий', author=author,
+                post_id=post_ids[number % len(post_ids)])
+        for number in range(comments)
+    ):
+        Comment.objects.bulk_create(batch)
+    recount_comments()
+
+
+def get_page_query(strategy, page, per_page):
+    from django.db.models import Count
+    from django.test import override_settings
+
+    from blog.service import get_base_request
+
+    mode = 'prefetch' if strategy == 'prefetch' else 'column'
+    with override_settings(BLOG_COMMENT_COUNTS=mode):
+        posts = get_base_request()
+    if strategy == 'annotate':
+        posts = posts.annotate(comments_total=Count('comments'))
+    start = (page - 1) * per_page
+    return posts[start:start + per_page]
+
+
+def measure(strategy, page, per_page, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        list(get_page_query(strategy, page, per_page))
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--posts', type=int, default=100000)
+    parser.add_argument('--comments', type=int, default=1000000)
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 100])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        setup_django(os.path.join(directory, 'bench.sqlite3'))
+        from blog.constant import POST_PER_PAGE
+
+        seed(args.posts, args.comments)
+        print(f'{"":10}' + ''.join(
+            f'{f"page {page}, ms":>14}' for page in args.pages
+        ))
+        for strategy in ('annotate', 'column', 'prefetch'):
+            print(f'{strategy:10}' + ''.join(
+                f'{measure(strategy, page, POST_PER_PAGE, args.repeat):>14.1f}'
+                for page in args.pages
+            ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+"""Read throughput of the feed while comments are being written.
+
+Runs the same workload against a fresh SQLite file twice: once with the
+SQLite defaults (rollback journal, synchronous=FULL) and once with the
+PRAGMAs from settings.SQLITE_PRAGMAS, and prints reads and writes per
+second for each.
+
+    python benchmarks/sqlite_concurrency.py --readers 4 --seconds 10
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / 'blogicum'
+
+CONFIGURATIONS = {
+    'rollback journal': {
+        'SQLITE_JOURNAL_MODE': 'DELETE',
+        'SQLITE_SYNCHRONOUS': 'FULL',
+        'SQLITE_MMAP_SIZE': '0',
+        'SQLITE_CACHE_SIZE': '-2000',
+        'SQLITE_BUSY_TIMEOUT': '5000',
+    },
+    'tuned (settings)': {},
+}
+
+
+def setup_django():
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
+    import django
+
+    django.setup()
+
+
+def seed(posts):
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+    from django.utils import timezone
+
+    from blog.models import Category, Post
+
+    call_command('migrate', verbosity=0)
+    author = get_user_model().objects.create(username='bench')
+    category = Category.objects.create(
+        title='Бенчмарк', description='-', slug='bench'
+    )
+    Post.objects.bulk_create(
+        Post(
+            title=f'Пост {number}',
+            text='Текст',
+            pub_date=timezone.now(),
+            author=author,
+            category=category,
+        )
+        for number in range(posts)
+    )
+    return author, list(Post.objects.values_list('pk', flat=True)[:100])
+
+
+class Counter:
+    def __init__(self):
+        self.counts = {'reads': 0, 'writes': 0, 'errors': 0}
+        self.lock = threading.Lock()
+
+    def repeat(self, key, action, deadline):
+        from django.db import connection
+
+        number = 0
+        while time.monotonic() < deadline:
+            try:
+                action(number)
+            except Exception:
+                outcome = 'errors'
+            else:
+                outcome = key
+            with self.lock:
+                self.counts[outcome] += 1
+            number += 1
+        connection.close()
+
+
+def run_workload(readers, seconds, posts):
+    setup_django()
+    from django.db import connection
+
+    from blog.models import Comment
+    from blog.service import get_base_request
+
+    author, post_ids = seed(posts)
+    connection.close()
+
+    def read(number):
+        list(get_base_request()[:10])
+
+    def write(number):
+        Comment.objects.create(
+            post_id=post_ids[number % len(post_ids)],
+            author=author,
+            text='Комментарий',
+        )
+
+    counter = Counter()
+    deadline = time.monotonic() + seconds
+    threads = [
+        threading.Thread(target=counter.repeat, args=('reads', read, deadline))
+        for _ in range(readers)
+    ]
+    threads.append(threading.Thread(
+        target=counter.repeat, args=('writes', write, deadline)
+    ))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {key: value / seconds for key, value in counter.counts.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--posts', type=int, default=1000)
+    parser.add_argument('--worker', action='store_true',
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_workload(args.readers, args.seconds, args.posts)))
+        return
+
+    print(f'{"":20} {"reads/s":>10} {"writes/s":>10} {"errors/s":>10}')
+    for name, pragmas in CONFIGURATIONS.items():
+        with tempfile.TemporaryDirectory() as directory:
+            env = {
+                **os.environ,
+                **pragmas,
+                'DB_ENGINE': 'sqlite',
+                'DB_NAME': os.path.join(directory, 'bench.sqlite3'),
+                'CACHE_DIR': os.path.join(directory, 'cache'),
+            }
+            output = subprocess.run(
+                [sys.executable, __file__, '--worker',
+                 '--readers', str(args.readers),
+                 '--seconds', str(args.seconds),
+                 '--posts', str(args.posts)],
+                env=env, check=True, capture_output=True, text=True,
+            ).stdout
+        result = json.loads(output.splitlines()[-1])
+        print(f'{name:20} {result["reads"]:>10.0f} '
+              f'{result["writes"]:>10.0f} {result["errors"]:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+"""Requests per second and p99 latency of the feed pages, WSGI vs ASGI.
+
+Each mode runs in its own process against a fresh SQLite file:
+
+* ``wsgi`` – sync views through the WSGI handler, one thread per client;
+* ``asgi sync`` – the same views through the ASGI handler;
+* ``asgi async`` – the views from blog.async_views (BLOG_ASYNC_VIEWS)
+  through the ASGI handler, clients as asyncio tasks.
+
+Requests go through the full middleware stack in-process, so the numbers
+compare the handlers and views, not an HTTP server.
+
+    python benchmarks/wsgi_vs_asgi.py --clients 16 --seconds 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / 'blogicum'
+ROUTES = 'index,post_detail,category_posts,profile'
+
+MODES = {
+    'wsgi': {'BLOG_ASYNC_VIEWS': ''},
+    'asgi sync': {'BLOG_ASYNC_VIEWS': ''},
+    'asgi async': {'BLOG_ASYNC_VIEWS': ROUTES},
+}
+
+
+def setup_django():
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
+    os.environ['JOBS_ALWAYS_EAGER'] = '1'
+    import django
+    from django.conf import settings
+
+    django.setup()
+    # The host the in-process clients send.
+    settings.ALLOWED_HOSTS.append('testserver')
+
+
+def seed(posts):
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+    from django.utils import timezone
+
+    from blog.models import Category, Post
+
+    call_command('migrate', verbosity=0)
+    author = get_user_model().objects.create(username='bench')
+    category = Category.objects.create(
+        title='Бенчмарк', description='-', slug='bench'
+    )
+    Post.objects.bulk_create(
+        Post(
+            title=f'Пост {number}',
+            text='Текст',
+            pub_date=timezone.now(),
+            author=author,
+            category=category,
+        )
+        for number in range(posts)
+    )
+    post_id = Post.objects.values_list('pk', flat=True).first()
+    return [
+        '/',
+        '/?page=2',
+        f'/posts/{post_id}/',
+        '/category/bench/',
+        '/profile/bench/',
+    ]
+
+
+def summarize(latencies, seconds, errors):
+    latencies.sort()
+    return {
+        'rps': len(latencies) / seconds,
+        'p50': statistics.median(latencies) * 1000 if latencies else 0,
+        'p99': (
+            latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0
+        ),
+        'errors': errors,
+    }
+
+
+def run_threads(urls, clients, seconds):
+    from django.db import connection
+    from django.test import Client
+
+    latencies = []
+    errors = []
+    deadline = time.monotonic() + seconds
+
+    def worker(offset):
+        client = Client()
+        number = offset
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            response = client.get(urls[number % len(urls)])
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                errors.append(response.status_code)
+            number += 1
+        connection.close()
+
+    threads = [
+        threading.Thread(target=worker, args=(offset,))
+        for offset in range(clients)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(latencies, seconds, len(errors))
+
+
+async def run_tasks(urls, clients, seconds):
+    from django.test import AsyncClient
+
+    latencies = []
+    errors = []
+    deadline = time.monotonic() + seconds
+
+    async def worker(offset):
+        client = AsyncClient()
+        number = offset
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            response = await client.get(urls[number % len(urls)])
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                errors.append(response.status_code)
+            number += 1
+
+    await asyncio.gather(*(worker(offset) for offset in range(clients)))
+    return summarize(latencies, seconds, len(errors))
+
+
+def run_mode(mode, clients, seconds, posts):
+    setup_django()
+    from django.db import connection
+
+    urls = seed(posts)
+    connection.close()
+    if mode == 'wsgi':
+        return run_threads(urls, clients, seconds)
+    return asyncio.run(run_tasks(urls, clients, seconds))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--posts', type=int, default=1000)
+    parser.add_argument('--mode', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(
+            run_mode(args.mode, args.clients, args.seconds, args.posts)
+        ))
+        return
+
+    print(f'{"":12} {"req/s":>8} {"p50, ms":>8} {"p99, ms":>8} {"errors":>7}')
+    for mode, env in MODES.items():
+        with tempfile.TemporaryDirectory() as directory:
+            env = {
+                **os.environ,
+                **env,
+                'DB_ENGINE': 'sqlite',
+                'DB_NAME': os.path.join(directory, 'bench.sqlite3'),
+                'CACHE_DIR': os.path.join(directory, 'cache'),
+            }
+            output = subprocess.run(
+                [sys.executable, __file__, '--mode', mode,
+                 '--clients', str(args.clients),
+                 '--seconds', str(args.seconds),
+                 '--posts', str(args.posts)],
+                env=env, check=True, capture_output=True, text=True,
+            ).stdout
+        result = json.loads(output.splitlines()[-1])
+        print(f'{mode:12} {result["rps"]:>8.0f} {result["p50"]:>8.1f} '
+              f'{result["p99"]:>8.1f} {result["errors"]:>7}')
+
+
+if __name__ == '__main__':
+    main()
@@ -3,6 +3,7 @@ from django.utils.text import Truncator
 
 from blog.constant import LEN_ADMIN_POST, MESSAGE_TEXT_RU
 from blog.models import Category, Location, Post, Comment
+from blog.search import search_posts
 
 admin.site.empty_value_display = 'Не задано'
 
@@ -34,6 +35,11 @@ class PostAdmin(admin.ModelAdmin):
     list_filter = ('is_published', 'category')
     list_display_links = ('title',)
 
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return super().get_search_results(request, queryset, search_term)
+        return search_posts(queryset, search_term, ranked=False), False
+
     def text_view(self, obj):
         if len(obj.text) > LEN_ADMIN_POST:
             return Truncator(obj.text).words(LEN_ADMIN_POST,
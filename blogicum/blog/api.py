@@ -0,0 +1,251 @@
+"""Read-only JSON API over posts, comments, categories and locations.
+
+Lists are cursor paginated. ``?fields=`` picks the fields to return,
+and only those columns are selected: rows come from values() querysets
+and go to JSON without model instances. Category and location fields
+are read from the lookup tables.
+"""
+import json
+from functools import wraps
+from typing import Callable, NamedTuple, Optional
+
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import Http404, HttpResponse
+from django.views.decorators.http import require_safe
+
+from blog.cache import cache_anonymous_page
+from blog.conditional import conditional_page
+from blog.constant import COMMENTS_PER_PAGE, POST_PER_PAGE
+from blog.lookups import categories, locations
+from blog.models import Comment
+from blog.paginator import CursorPaginator
+from blog.service import get_base_request, get_last_published
+from core.db_routers import read_from_replica
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class InvalidFields(ValueError):
+    pass
+
+
+class Field(NamedTuple):
+    path: str
+    convert: Optional[Callable] = None
+
+
+def get_category_slug(category_id):
+    category = categories.get(category_id)
+    return category.slug if category is not None else None
+
+
+def get_location_name(location_id):
+    location = locations.get(location_id)
+    if location is None or not location.is_published:
+        return None
+    return location.name
+
+
+def get_image_url(name):
+    return default_storage.url(name) if name else None
+
+
+class Resource:
+    """Fields a client may ask for and the columns that hold them."""
+
+    def __init__(self, fields, ordering=()):
+        self.fields = fields
+        self.ordering = ordering
+        # The cursor is built from the ordering columns of the last row.
+        self.cursor_paths = ['id'] + [
+            name.lstrip('-') for name in ordering if name.lstrip('-') != 'pk'
+        ]
+
+    def get_field_names(self, request):
+        value = request.GET.get('fields')
+        if not value:
+            return list(self.fields)
+        names = [name.strip() for name in value.split(',') if name.strip()]
+        unknown = [name for name in names if name not in self.fields]
+        if unknown:
+            raise InvalidFields(
+                'Неизвестные поля: {}. Доступные поля: {}.'.format(
+                    ', '.join(unknown), ', '.join(self.fields)
+                )
+            )
+        return names
+
+    def get_values(self, queryset, names):
+        paths = {self.fields[name].path for name in names}
+        return queryset.values(*paths.union(self.cursor_paths))
+
+    def serialize_row(self, row, names):
+        data = {}
+        for name in names:
+            field = self.fields[name]
+            value = row[field.path]
+            data[name] = field.convert(value) if field.convert else value
+        return data
+
+    def serialize_object(self, obj, names):
+        return {name: getattr(obj, self.fields[name].path) for name in names}
+
+
+POSTS = Resource(
+    {
+        'id': Field('id'),
+        'title': Field('title'),
+        'text': Field('text'),
+        'pub_date': Field('pub_date'),
+        'author': Field('author__username'),
+        'category': Field('category_id', get_category_slug),
+        'location': Field('location_id', get_location_name),
+        'image': Field('image', get_image_url),
+        'comment_count': Field('comment_count'),
+    },
+    ordering=('-pub_date', '-pk'),
+)
+COMMENTS = Resource(
+    {
+        'id': Field('id'),
+        'text': Field('text'),
+        'created_at': Field('created_at'),
+        'author': Field('author__username'),
+    },
+    ordering=('created_at', 'pk'),
+)
+CATEGORIES = Resource({
+    'id': Field('id'),
+    'slug': Field('slug'),
+    'title': Field('title'),
+    'description': Field('description'),
+})
+LOCATIONS = Resource({
+    'id': Field('id'),
+    'name': Field('name'),
+})
+
+
+def dumps(data):
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_UTC_Z)
+    return json.dumps(
+        data, cls=DjangoJSONEncoder, ensure_ascii=False
+    ).encode()
+
+
+def json_response(data, status=200):
+    return HttpResponse(
+        dumps(data), content_type='application/json', status=status
+    )
+
+
+def api_view(view):
+    """Answer GET and HEAD only, and report errors as JSON."""
+    @require_safe
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        try:
+            return view(request, *args, **kwargs)
+        except InvalidFields as error:
+            return json_response({'error': str(error)}, status=400)
+        except Http404:
+            return json_response({'error': 'Не найдено.'}, status=404)
+    return wrapper
+
+
+def get_cursor_url(request, cursor):
+    if cursor is None:
+        return None
+    query = request.GET.copy()
+    query['cursor'] = cursor
+    return request.build_absolute_uri(f'?{query.urlencode()}')
+
+
+def get_list_response(request, resource, queryset, per_page):
+    names = resource.get_field_names(request)
+    page = CursorPaginator(
+        resource.get_values(queryset, names), per_page, resource.ordering
+    ).get_page(request.GET.get('cursor'))
+    return json_response({
+        'results': [resource.serialize_row(row, names) for row in page],
+        'next': get_cursor_url(request, page.next_cursor),
+        'previous': get_cursor_url(request, page.previous_cursor),
+    })
+
+
+def filter_posts(request, posts):
+    category_slug = request.GET.get('category')
+    if category_slug:
+        category = categories.get_by('slug', category_slug)
+        if category is None:
+            return posts.none()
+        posts = posts.filter(category_id=category.pk)
+    username = request.GET.get('author')
+    if username:
+        posts = posts.filter(author__username=username)
+    return posts
+
+
+@read_from_replica()
+@conditional_page('feed', last_published=get_last_published)
+@cache_anonymous_page('feed')
+@api_view
+def post_list(request):
+    posts = filter_posts(request, get_base_request())
+    return get_list_response(request, POSTS, posts, POST_PER_PAGE)
+
+
+@read_from_replica()
+@conditional_page('post:{post_id}')
+@cache_anonymous_page('post:{post_id}')
+@api_view
+def post_detail(request, post_id):
+    names = POSTS.get_field_names(request)
+    row = POSTS.get_values(
+        get_base_request().filter(pk=post_id), names
+    ).first()
+    if row is None:
+        raise Http404
+    return json_response(POSTS.serialize_row(row, names))
+
+
+@read_from_replica()
+@conditional_page('post:{post_id}')
+@cache_anonymous_page('post:{post_id}')
+@api_view
+def comment_list(request, post_id):
+    if not get_base_request().filter(pk=post_id).exists():
+        raise Http404
+    comments = Comment.objects.filter(post_id=post_id)
+    return get_list_response(request, COMMENTS, comments, COMMENTS_PER_PAGE)
+
+
+# Category and location changes touch ALL_PAGES_TAG, which both
+# decorators always read, once the lookup tables hold the new rows.
+@read_from_replica()
+@conditional_page()
+@cache_anonymous_page()
+@api_view
+def category_list(request):
+    names = CATEGORIES.get_field_names(request)
+    return json_response({'results': [
+        CATEGORIES.serialize_object(category, names)
+        for category in categories.published()
+    ]})
+
+
+@read_from_replica()
+@conditional_page()
+@cache_anonymous_page()
+@api_view
+def location_list(request):
+    names = LOCATIONS.get_field_names(request)
+    return json_response({'results': [
+        LOCATIONS.serialize_object(location, names)
+        for location in locations.published()
+    ]})
@@ -5,3 +5,8 @@ class BlogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'blog'
     verbose_name = 'Блог'
+
+    def ready(self):
+        import blog.checks  # noqa: F401
+        import blog.jobs  # noqa: F401
+        import blog.signals  # noqa: F401
@@ -0,0 +1,103 @@
+"""Async variants of the read-heavy pages, enabled per route.
+
+They read everything the template needs before rendering, through the
+async ORM and cache interfaces, so no request holds a worker thread while
+it waits for the database. See BLOG_ASYNC_VIEWS.
+"""
+from django.conf import settings
+from django.http import Http404
+from django.shortcuts import render
+
+from blog.cache import cache_anonymous_page
+from blog.conditional import conditional_page
+from blog.constant import POST_PER_PAGE
+from blog.forms import CommentForm
+from blog.lookups import aprefetch_lookups, categories
+from blog.materialized import author_feed, category_feed
+from blog.models import Post
+from blog.paginator import CursorPaginator
+from blog.service import (aget_feed_page, aget_last_published, aget_page,
+                          aget_post_for_user_or_404, aget_profile_or_404,
+                          get_base_request, get_comments_paginator)
+from core.auth import aload_user
+from core.db_routers import read_from_replica
+
+
+@read_from_replica()
+@conditional_page('feed', last_published=aget_last_published)
+@cache_anonymous_page('feed')
+async def index(request):
+    await aprefetch_lookups()
+    posts = get_base_request()
+    if settings.BLOG_FEED_PAGINATION == 'cursor':
+        page_obj = await CursorPaginator(posts, POST_PER_PAGE).aget_page(
+            request.GET.get('cursor')
+        )
+    else:
+        page_obj = await aget_page(
+            posts, request.GET.get('page'), tags=['feed']
+        )
+    return render(request, 'blog/index.html', {'page_obj': page_obj})
+
+
+@read_from_replica()
+@conditional_page('category:{category_slug}',
+                  last_published=aget_last_published)
+@cache_anonymous_page('category:{category_slug}')
+async def category_posts(request, category_slug):
+    await aprefetch_lookups()
+    category = categories.get_by('slug', category_slug)
+    if category is None or not category.is_published:
+        raise Http404
+    page_number = request.GET.get('page')
+    tags = [f'category:{category_slug}']
+    if settings.BLOG_MATERIALIZED_FEEDS:
+        page_obj = await aget_feed_page(
+            category_feed(category.pk), page_number, tags=tags
+        )
+    else:
+        posts = get_base_request().filter(category_id=category.pk)
+        page_obj = await aget_page(posts, page_number, tags=tags)
+    return render(request, 'blog/category.html',
+                  {'category': category, 'page_obj': page_obj})
+
+
+@read_from_replica()
+@conditional_page('post:{post_id}')
+@cache_anonymous_page('post:{post_id}')
+async def post_detail(request, post_id):
+    await aprefetch_lookups()
+    user = await aload_user(request)
+    post = await aget_post_for_user_or_404(
+        user, post_id, Post.objects.select_related('author').with_lookups()
+    )
+    comments = await get_comments_paginator(post).aget_page()
+    return render(request, 'blog/detail.html', {
+        'post': post,
+        'object': post,
+        'form': CommentForm(),
+        'comments': comments,
+    })
+
+
+@read_from_replica()
+@conditional_page('profile:{username}', last_published=aget_last_published)
+@cache_anonymous_page('profile:{username}')
+async def profile(request, username):
+    await aprefetch_lookups()
+    user = await aload_user(request)
+    author = await aget_profile_or_404(username, user)
+    page_number = request.GET.get('page')
+    if settings.BLOG_MATERIALIZED_FEEDS and author.pk != user.pk:
+        page_obj = await aget_feed_page(
+            author_feed(author.pk), page_number, author.post_count
+        )
+    else:
+        posts = (
+            Post.objects.for_profile(author, user)
+            .for_cards()
+            .order_by('-pub_date')
+        )
+        page_obj = await aget_page(posts, page_number, author.post_count)
+    return render(request, 'blog/profile.html',
+                  {'profile': author, 'page_obj': page_obj})
@@ -0,0 +1,228 @@
+import asyncio
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Min
+from django.utils import timezone
+
+from blog.models import Post
+from core.auth import aload_user
+
+POST_CARD_GENERATION_KEY = 'post_card:generation'
+PAGE_CACHE_ALIAS = 'pages'
+ALL_PAGES_TAG = 'all'
+
+
+def shared_cache():
+    """The cache every web and job process sees (BLOG_SHARED_CACHE).
+
+    Versions and generations live here, so a job or another worker that
+    bumps one invalidates the entries of all processes.
+    """
+    return caches[settings.BLOG_SHARED_CACHE]
+
+
+def new_generation():
+    # A lost counter restarts from the clock, so it never reuses old keys.
+    return time.time_ns() // 1000
+
+
+def get_post_card_generation():
+    return shared_cache().get_or_set(
+        POST_CARD_GENERATION_KEY, new_generation, None
+    )
+
+
+def get_post_card_key(post_id, generation=None):
+    if generation is None:
+        generation = get_post_card_generation()
+    return f'post_card:{generation}:{post_id}'
+
+
+def get_post_card(post_id):
+    return shared_cache().get(get_post_card_key(post_id))
+
+
+def get_post_cards(post_ids):
+    """Cached cards of a list in two round trips, whatever its length.
+
+    Returns the generation the cards were read under and the cards found,
+    by post id.
+    """
+    generation = get_post_card_generation()
+    keys = {get_post_card_key(pk, generation): pk for pk in post_ids}
+    cards = shared_cache().get_many(keys)
+    return generation, {keys[key]: html for key, html in cards.items()}
+
+
+def set_post_card(post_id, html, generation=None):
+    shared_cache().set(
+        get_post_card_key(post_id, generation), html,
+        settings.BLOG_POST_CARD_CACHE_TIMEOUT
+    )
+
+
+def forget_post_card(post_id):
+    shared_cache().delete(get_post_card_key(post_id))
+
+
+def forget_all_post_cards():
+    try:
+        shared_cache().incr(POST_CARD_GENERATION_KEY)
+    except ValueError:
+        shared_cache().set(POST_CARD_GENERATION_KEY, new_generation(), None)
+
+
+def get_page_tag_versions(tags):
+    # Tag versions are shared; the pages keyed by them may stay local.
+    versions_cache = shared_cache()
+    keys = [f'page_tag:{tag}' for tag in tags]
+    versions = versions_cache.get_many(keys)
+    missing = {key: new_generation() for key in keys if key not in versions}
+    if missing:
+        versions_cache.set_many(missing, None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+async def aget_page_tag_versions(tags):
+    versions_cache = shared_cache()
+    keys = [f'page_tag:{tag}' for tag in tags]
+    versions = await versions_cache.aget_many(keys)
+    missing = {key: new_generation() for key in keys if key not in versions}
+    if missing:
+        await versions_cache.aset_many(missing, None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def touch_page_tags(*tags):
+    # Versions are the time of the last touch, so they double as
+    # Last-Modified values for conditional requests.
+    version = new_generation()
+    shared_cache().set_many(
+        {f'page_tag:{tag}': version for tag in tags}, None
+    )
+
+
+def get_post_page_tags(post):
+    tags = ['feed', f'post:{post.pk}', f'profile:{post.author.username}']
+    if post.category_id:
+        tags.append(f'category:{post.category.slug}')
+    return tags
+
+
+def get_next_pub_date_query(now):
+    return Post.objects.filter(is_published=True, pub_date__gt=now)
+
+
+def cap_page_cache_timeout(now, next_pub_date):
+    # Pages must expire by the time the next scheduled post goes live.
+    timeout = settings.BLOG_PAGE_CACHE_TIMEOUT
+    if next_pub_date is not None:
+        timeout = min(timeout, (next_pub_date - now).total_seconds())
+    return timeout
+
+
+def get_page_cache_timeout():
+    now = timezone.now()
+    next_pub_date = get_next_pub_date_query(now).aggregate(
+        next_pub_date=Min('pub_date')
+    )['next_pub_date']
+    return cap_page_cache_timeout(now, next_pub_date)
+
+
+async def aget_page_cache_timeout():
+    now = timezone.now()
+    next_pub_date = (await get_next_pub_date_query(now).aaggregate(
+        next_pub_date=Min('pub_date')
+    ))['next_pub_date']
+    return cap_page_cache_timeout(now, next_pub_date)
+
+
+def is_cacheable_request(request):
+    return (settings.BLOG_PAGE_CACHE_TIMEOUT
+            and request.method in ('GET', 'HEAD')
+            and not request.user.is_authenticated)
+
+
+def is_cacheable_response(response):
+    return response.status_code == 200 and not response.streaming
+
+
+def get_page_key(request, versions):
+    digest = hashlib.md5(
+        f'{request.get_full_path()}|{versions}'.encode()
+    ).hexdigest()
+    return f'page:{digest}'
+
+
+def make_async_page_cache(view, get_tags):
+    page_cache = caches[PAGE_CACHE_ALIAS]
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        await aload_user(request)
+        if not is_cacheable_request(request):
+            return await view(request, *args, **kwargs)
+        versions = await aget_page_tag_versions(get_tags(kwargs))
+        key = get_page_key(request, versions)
+        response = await page_cache.aget(key)
+        if response is not None:
+            return response
+        response = await view(request, *args, **kwargs)
+        if is_cacheable_response(response):
+            await page_cache.aset(
+                key, response, await aget_page_cache_timeout()
+            )
+        return response
+    return wrapper
+
+
+def make_sync_page_cache(view, get_tags):
+    page_cache = caches[PAGE_CACHE_ALIAS]
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not is_cacheable_request(request):
+            return view(request, *args, **kwargs)
+        versions = get_page_tag_versions(get_tags(kwargs))
+        key = get_page_key(request, versions)
+        response = page_cache.get(key)
+        if response is not None:
+            return response
+        response = view(request, *args, **kwargs)
+        if not is_cacheable_response(response):
+            return response
+
+        def store(rendered):
+            page_cache.set(key, rendered, get_page_cache_timeout())
+
+        if getattr(response, 'is_rendered', True):
+            store(response)
+        else:
+            response.add_post_render_callback(store)
+        return response
+    return wrapper
+
+
+def cache_anonymous_page(*tag_templates):
+    """Cache the whole response for anonymous visitors.
+
+    The key is the full path plus the versions of the page tags, so
+    touching a tag makes every page that depends on it stale at once.
+    Works for sync and async views alike.
+    """
+    def get_tags(kwargs):
+        return [ALL_PAGES_TAG] + [
+            template.format(**kwargs) for template in tag_templates
+        ]
+
+    def decorator(view):
+        if asyncio.iscoroutinefunction(view):
+            return make_async_page_cache(view, get_tags)
+        return make_sync_page_cache(view, get_tags)
+    return decorator
@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.core import checks
+
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.dummy.DummyCache',
+    'django.core.cache.backends.locmem.LocMemCache',
+)
+
+
+@checks.register(checks.Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """BLOG_SHARED_CACHE must be seen by every web and job process.
+
+    Page tag versions, post cards and lookup tables are invalidated
+    there; in a per-process cache an edit only reaches the process that
+    made it.
+    """
+    alias = settings.BLOG_SHARED_CACHE
+    backend = settings.CACHES.get(alias, {}).get('BACKEND')
+    if backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [checks.Error(
+        f'The BLOG_SHARED_CACHE alias {alias!r} uses {backend}, which is '
+        'private to one process.',
+        hint='Set CACHE_BACKEND to file or redis, or silence blog.E001 '
+             'when the site runs a single process.',
+        id='blog.E001',
+    )]
@@ -0,0 +1,107 @@
+import asyncio
+import hashlib
+import inspect
+import time
+from functools import wraps
+
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+
+from blog.cache import (ALL_PAGES_TAG, aget_page_tag_versions,
+                        get_page_tag_versions)
+from core.auth import aload_user
+
+
+def get_page_validators(request, versions, last_published=None):
+    modified = max(versions) // 1_000_000
+    if last_published is not None:
+        modified = max(modified, int(last_published.timestamp()))
+    digest = hashlib.md5('|'.join(map(str, (
+        request.get_full_path(),
+        versions,
+        modified,
+        request.user.pk,
+        request.META.get('CSRF_COOKIE'),
+    ))).encode()).hexdigest()
+    if request.user.is_authenticated:
+        # The page also depends on who is looking at it, which only the
+        # ETag can tell apart.
+        modified = None
+    elif time.time() < modified + 1:
+        # Last-Modified has whole seconds, so a change later in this second
+        # would keep it; until the second is over only the ETag validates.
+        modified = None
+    return quote_etag(digest), modified
+
+
+def set_validators(response, etag, modified):
+    if response.status_code == 200:
+        # Cached pages carry the validators of the first visitor.
+        response['ETag'] = etag
+        if modified is not None:
+            response['Last-Modified'] = http_date(modified)
+        elif response.has_header('Last-Modified'):
+            del response['Last-Modified']
+    return response
+
+
+def make_async_conditional(view, get_tags, last_published):
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return await view(request, *args, **kwargs)
+        await aload_user(request)
+        versions = await aget_page_tag_versions(get_tags(kwargs))
+        published = last_published(**kwargs) if last_published else None
+        if inspect.isawaitable(published):
+            published = await published
+        etag, modified = get_page_validators(request, versions, published)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=modified
+        )
+        if response is not None:
+            return response
+        response = await view(request, *args, **kwargs)
+        return set_validators(response, etag, modified)
+    return wrapper
+
+
+def make_sync_conditional(view, get_tags, last_published):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return view(request, *args, **kwargs)
+        etag, modified = get_page_validators(
+            request,
+            get_page_tag_versions(get_tags(kwargs)),
+            last_published(**kwargs) if last_published else None,
+        )
+        response = get_conditional_response(
+            request, etag=etag, last_modified=modified
+        )
+        if response is not None:
+            return response
+        response = view(request, *args, **kwargs)
+        return set_validators(response, etag, modified)
+    return wrapper
+
+
+def conditional_page(*tag_templates, last_published=None):
+    """Answer 304 Not Modified while nothing on the page has changed.
+
+    Validators come from the page tag versions, which are bumped on every
+    change of the posts and comments behind the page, and from the newest
+    pub_date reported by ``last_published(**kwargs)``, which moves when a
+    scheduled post goes live. Neither requires rendering the page.
+    Works for sync and async views; ``last_published`` may be async too.
+    """
+    def get_tags(kwargs):
+        return [ALL_PAGES_TAG] + [
+            template.format(**kwargs) for template in tag_templates
+        ]
+
+    def decorator(view):
+        if asyncio.iscoroutinefunction(view):
+            return make_async_conditional(view, get_tags, last_published)
+        return make_sync_conditional(view, get_tags, last_published)
+    return decorator
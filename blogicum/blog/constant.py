@@ -3,3 +3,6 @@ COUNT_POST = 5
 HEADER_MODEL_LEN = 30
 MESSAGE_TEXT_RU = 'Обрезано'
 POST_PER_PAGE = 10
+COMMENTS_PER_PAGE = 20
+POST_IMAGE_WIDTHS = (320, 640, 1280)
+FEED_ITEMS = 20
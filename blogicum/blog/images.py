@@ -0,0 +1,78 @@
+import posixpath
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from PIL import Image
+
+from blog.constant import POST_IMAGE_WIDTHS
+
+VARIANT_FORMATS = {'webp': 'WEBP', 'jpg': 'JPEG'}
+
+
+def get_variant_name(name, width, extension):
+    root, _ = posixpath.splitext(name)
+    return f'{root}_{width}w.{extension}'
+
+
+def get_srcsets(image, variants):
+    if not image or variants.get('name') != image.name:
+        return {}
+    if not variants['widths']:
+        return {}
+    return {
+        extension: ', '.join(
+            '{} {}w'.format(
+                image.storage.url(
+                    get_variant_name(image.name, width, extension)
+                ),
+                width,
+            )
+            for width in variants['widths']
+        )
+        for extension in VARIANT_FORMATS
+    }
+
+
+def delete_image_variants(storage, variants):
+    """Remove the files described by a ``Post.image_variants`` value."""
+    name = variants.get('name')
+    if not name:
+        return
+    for width in variants.get('widths', []):
+        for extension in VARIANT_FORMATS:
+            storage.delete(get_variant_name(name, width, extension))
+
+
+def create_image_variants(image):
+    """Save downscaled WebP and JPEG copies next to the original.
+
+    Returns the description stored in ``Post.image_variants``.
+    """
+    storage = image.storage
+    with image.open('rb'):
+        original = Image.open(image)
+        original.load()
+    if original.mode not in ('RGB', 'RGBA'):
+        original = original.convert('RGBA')
+    widths = [width for width in POST_IMAGE_WIDTHS if width < original.width]
+    for width in widths:
+        height = round(original.height * width / original.width)
+        resized = original.resize(
+            (width, height), Image.Resampling.LANCZOS
+        )
+        for extension, image_format in VARIANT_FORMATS.items():
+            variant = resized
+            if image_format == 'JPEG' and variant.mode != 'RGB':
+                variant = variant.convert('RGB')
+            buffer = BytesIO()
+            variant.save(buffer, format=image_format, quality=82)
+            name = get_variant_name(image.name, width, extension)
+            if storage.exists(name):
+                storage.delete(name)
+            storage.save(name, ContentFile(buffer.getvalue()))
+    return {
+        'name': image.name,
+        'width': original.width,
+        'height': original.height,
+        'widths': widths,
+    }
@@ -0,0 +1,76 @@
+from blog.cache import forget_post_card, get_post_page_tags, touch_page_tags
+from blog.images import create_image_variants, delete_image_variants
+from blog.models import Post
+from blog.search import index_post, index_posts, remove_post
+from blog.service import recount_comments
+from core.jobs import register
+
+
+@register('blog.make_image_variants')
+def make_image_variants(post_id):
+    post = Post.objects.select_related('author', 'category').filter(
+        pk=post_id
+    ).first()
+    if post is None:
+        return
+    if not post.image:
+        variants = {}
+    elif post.image_variants.get('name') != post.image.name:
+        try:
+            variants = create_image_variants(post.image)
+        except OSError:
+            variants = {'name': post.image.name, 'widths': []}
+    else:
+        return
+    if variants != post.image_variants:
+        Post.objects.filter(pk=post_id).update(image_variants=variants)
+        forget_post_card(post_id)
+        touch_page_tags(*get_post_page_tags(post))
+        if post.image_variants.get('name') != variants.get('name'):
+            delete_image_variants(
+                post.image.storage, post.image_variants
+            )
+
+
+@register('blog.delete_image_variants')
+def delete_post_image_variants(variants):
+    delete_image_variants(
+        Post._meta.get_field('image').storage, variants
+    )
+
+
+@register('blog.index_post')
+def index_saved_post(post_id):
+    post = Post.objects.select_related('location', 'author').filter(
+        pk=post_id
+    ).first()
+    if post is None:
+        remove_post(post_id)
+    else:
+        index_post(post)
+
+
+@register('blog.remove_post')
+def remove_deleted_post(post_id):
+    remove_post(post_id)
+
+
+@register('blog.index_location_posts')
+def index_location_posts(location_id):
+    index_posts(Post.objects.filter(location_id=location_id))
+
+
+@register('blog.index_author_posts')
+def index_author_posts(author_id):
+    index_posts(Post.objects.filter(author_id=author_id))
+
+
+@register('blog.recount_comments')
+def recount_post_comments(post_id):
+    posts = Post.objects.select_related('author', 'category').filter(
+        pk=post_id
+    )
+    if recount_comments(posts):
+        forget_post_card(post_id)
+        for post in posts:
+            touch_page_tags(*get_post_page_tags(post))
@@ -0,0 +1,124 @@
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+
+from core.db_routers import pin_to_primary
+
+
+class LookupTable:
+    """Whole small table kept in process memory, keyed by pk and slug.
+
+    The rows are reloaded when the table version stored in the shared
+    cache (BLOG_SHARED_CACHE) changes, so one committed save invalidates
+    every worker. Workers that notice a new version take the rows from the
+    cache before falling back to the database. The version expires with
+    the rows, so a lost bump heals after BLOG_LOOKUP_CACHE_TIMEOUT.
+    """
+
+    def __init__(self, model_label, *key_fields):
+        self.model_label = model_label
+        self.key_fields = key_fields
+        self.version_key = f'lookup:{model_label}:version'
+        self._snapshot = None
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    @property
+    def cache(self):
+        return caches[settings.BLOG_SHARED_CACHE]
+
+    def _build(self, version, rows):
+        indexes = {'pk': {row.pk: row for row in rows}}
+        for field in self.key_fields:
+            indexes[field] = {getattr(row, field): row for row in rows}
+        self._snapshot = (version, indexes)
+        return indexes
+
+    def _get_rows_key(self, version):
+        return f'lookup:{self.model_label}:{version}'
+
+    def _load(self, version):
+        rows_key = self._get_rows_key(version)
+        rows = self.cache.get(rows_key)
+        if rows is None:
+            # A lagging replica would cache old rows under the new version.
+            with pin_to_primary():
+                rows = list(self.model.objects.all())
+            self.cache.set(
+                rows_key, rows, settings.BLOG_LOOKUP_CACHE_TIMEOUT
+            )
+        return self._build(version, rows)
+
+    async def aprefetch(self):
+        """Load the current version without blocking the event loop.
+
+        Async views call this first, so the synchronous accessors below
+        are served from memory.
+        """
+        version = await self.cache.aget_or_set(
+            self.version_key, time.time_ns,
+            settings.BLOG_LOOKUP_CACHE_TIMEOUT
+        )
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot[0] == version:
+            return
+        rows_key = self._get_rows_key(version)
+        rows = await self.cache.aget(rows_key)
+        if rows is None:
+            with pin_to_primary():
+                rows = [row async for row in self.model.objects.all()]
+            await self.cache.aset(
+                rows_key, rows, settings.BLOG_LOOKUP_CACHE_TIMEOUT
+            )
+        self._build(version, rows)
+
+    def _get_indexes(self):
+        version = self.cache.get_or_set(
+            self.version_key, time.time_ns,
+            settings.BLOG_LOOKUP_CACHE_TIMEOUT
+        )
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot[0] == version:
+            return snapshot[1]
+        return self._load(version)
+
+    def get(self, pk):
+        return self._get_indexes()['pk'].get(pk)
+
+    def get_by(self, field, value):
+        return self._get_indexes()[field].get(value)
+
+    def published(self):
+        return [
+            row for row in self._get_indexes()['pk'].values()
+            if row.is_published
+        ]
+
+    def published_ids(self):
+        return [row.pk for row in self.published()]
+
+    def forget(self):
+        """Start a new version and load it right away in this process.
+
+        Call it once the change is committed (``transaction.on_commit``):
+        inside the transaction it would cache rows that a rollback undoes,
+        or let another worker cache the old rows under the new version.
+        """
+        version = time.time_ns()
+        self.cache.set(
+            self.version_key, version, settings.BLOG_LOOKUP_CACHE_TIMEOUT
+        )
+        self._load(version)
+
+
+categories = LookupTable('blog.Category', 'slug')
+locations = LookupTable('blog.Location')
+
+
+async def aprefetch_lookups():
+    await categories.aprefetch()
+    await locations.aprefetch()
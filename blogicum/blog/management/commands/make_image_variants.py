@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from blog.jobs import make_image_variants
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Создаёт уменьшенные копии изображений публикаций.'
+
+    def handle(self, *args, **options):
+        processed = 0
+        for post in Post.objects.exclude(image='').iterator():
+            if post.image_variants.get('name') == post.image.name:
+                continue
+            # The job also deletes outdated copies and purges the caches.
+            make_image_variants(post.pk)
+            processed += 1
+        self.stdout.write(
+            self.style.SUCCESS(f'Обработано изображений: {processed}')
+        )
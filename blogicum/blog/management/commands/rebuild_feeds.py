@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from blog.materialized import rebuild_feed_entries
+
+
+class Command(BaseCommand):
+    help = 'Заново заполняет предрассчитанные ленты категорий и авторов.'
+
+    def handle(self, *args, **options):
+        entries = rebuild_feed_entries()
+        self.stdout.write(
+            self.style.SUCCESS(f'Записей в лентах: {entries}')
+        )
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+from blog.search import index_posts
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает полнотекстовый индекс публикаций.'
+
+    def handle(self, *args, **options):
+        index_posts(Post.objects.all())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Проиндексировано публикаций: {Post.objects.count()}'
+            )
+        )
@@ -0,0 +1,50 @@
+from blog.models import FeedEntry, Post
+
+
+def category_feed(category_id):
+    return f'category:{category_id}'
+
+
+def author_feed(author_id):
+    return f'author:{author_id}'
+
+
+def get_post_entries(post):
+    if not post.is_published:
+        return []
+    feeds = [author_feed(post.author_id)]
+    if post.category_id:
+        feeds.append(category_feed(post.category_id))
+    return [
+        FeedEntry(
+            feed=feed,
+            post_id=post.pk,
+            category_id=post.category_id,
+            pub_date=post.pub_date,
+        )
+        for feed in feeds
+    ]
+
+
+def refresh_feed_entries(posts):
+    """Replace the feed entries of the given posts."""
+    posts = list(posts)
+    FeedEntry.objects.filter(post__in=[post.pk for post in posts]).delete()
+    FeedEntry.objects.bulk_create(
+        entry for post in posts for entry in get_post_entries(post)
+    )
+
+
+def rebuild_feed_entries(batch_size=1000):
+    FeedEntry.objects.all().delete()
+    posts = Post.objects.filter(is_published=True).only(
+        'pk', 'is_published', 'author_id', 'category_id', 'pub_date'
+    )
+    batch = []
+    for post in posts.iterator(chunk_size=batch_size):
+        batch.extend(get_post_entries(post))
+        if len(batch) >= batch_size:
+            FeedEntry.objects.bulk_create(batch)
+            batch = []
+    FeedEntry.objects.bulk_create(batch)
+    return FeedEntry.objects.count()
@@ -0,0 +1,92 @@
+import re
+
+from django.db import migrations
+
+try:
+    import snowballstemmer
+except ImportError:
+    snowballstemmer = None
+
+# Frozen copy of the blog.search schema and document format as of this
+# migration; later changes to blog.search need their own migration.
+SQLITE_TABLE = 'blog_post_fts'
+POSTGRES_TABLE = 'blog_post_search'
+WORD_RE = re.compile(r'\w+')
+
+
+def stem_words(text):
+    words = WORD_RE.findall(text.lower())
+    if snowballstemmer is None:
+        return words
+    return snowballstemmer.stemmer('russian').stemWords(words)
+
+
+def write_document(cursor, vendor, post_id, fields):
+    if vendor == 'sqlite':
+        cursor.execute(
+            f'INSERT INTO {SQLITE_TABLE} '
+            '(rowid, title, text, location, author) '
+            'VALUES (%s, %s, %s, %s, %s)',
+            [post_id] + [' '.join(stem_words(field)) for field in fields],
+        )
+    elif vendor == 'postgresql':
+        cursor.execute(
+            f'INSERT INTO {POSTGRES_TABLE} (post_id, document) VALUES (%s, '
+            "setweight(to_tsvector('russian', %s), 'A') || "
+            "setweight(to_tsvector('russian', %s), 'B') || "
+            "setweight(to_tsvector('russian', %s), 'C') || "
+            "setweight(to_tsvector('russian', %s), 'C'))",
+            [post_id] + fields,
+        )
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            f'CREATE VIRTUAL TABLE {SQLITE_TABLE} USING fts5('
+            'title, text, location, author, '
+            "tokenize = 'unicode61 remove_diacritics 2')"
+        )
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            f'CREATE TABLE {POSTGRES_TABLE} ('
+            'post_id bigint PRIMARY KEY REFERENCES blog_post (id) '
+            'ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, '
+            'document tsvector NOT NULL)'
+        )
+        schema_editor.execute(
+            f'CREATE INDEX {POSTGRES_TABLE}_document_idx '
+            f'ON {POSTGRES_TABLE} USING GIN (document)'
+        )
+    else:
+        return
+    Post = apps.get_model('blog', 'Post')
+    posts = Post.objects.select_related('location', 'author').iterator()
+    with schema_editor.connection.cursor() as cursor:
+        for post in posts:
+            write_document(cursor, vendor, post.pk, [
+                post.title,
+                post.text,
+                post.location.name if post.location_id else '',
+                post.author.username,
+            ])
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {SQLITE_TABLE}')
+    elif vendor == 'postgresql':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {POSTGRES_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0020_comment_post_created_at_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
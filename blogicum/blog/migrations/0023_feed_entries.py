@@ -0,0 +1,53 @@
+# Generated by Django 3.2.16 on 2026-10-18 19:16
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_feed_entries(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    FeedEntry = apps.get_model('blog', 'FeedEntry')
+    entries = []
+    for post in Post.objects.filter(is_published=True).iterator():
+        feeds = [f'author:{post.author_id}']
+        if post.category_id:
+            feeds.append(f'category:{post.category_id}')
+        entries.extend(
+            FeedEntry(feed=feed, post_id=post.pk,
+                      category_id=post.category_id, pub_date=post.pub_date)
+            for feed in feeds
+        )
+    FeedEntry.objects.bulk_create(entries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0022_post_image_variants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('feed', models.CharField(max_length=64, verbose_name='Лента')),
+                ('pub_date', models.DateTimeField(verbose_name='Дата и время публикации')),
+                ('category', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='blog.category')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_entries', to='blog.post')),
+            ],
+            options={
+                'verbose_name': 'запись ленты',
+                'verbose_name_plural': 'Записи лент',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='feedentry',
+            index=models.Index(fields=['feed', '-pub_date', '-post'], name='feed_entry_feed_pub_date_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='feedentry',
+            constraint=models.UniqueConstraint(fields=('feed', 'post'), name='feed_entry_unique_post'),
+        ),
+        migrations.RunPython(fill_feed_entries, migrations.RunPython.noop),
+    ]
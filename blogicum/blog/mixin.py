@@ -1,14 +1,16 @@
+from django.conf import settings
 from django.contrib.auth.mixins import UserPassesTestMixin
 from django.shortcuts import redirect
 from django.urls import reverse
 
 from blog.models import Comment
+from blog.paginator import CursorPaginator
+from blog.streaming import render_streaming
 
 
 class OnlyAuthorMixin(UserPassesTestMixin):
     def test_func(self):
-        object = self.get_object()
-        return object.author == self.request.user
+        return self.get_object().author_id == self.request.user.id
 
     def handle_no_permission(self):
         return redirect('blog:post_detail', self.kwargs["post_id"])
@@ -24,3 +26,23 @@ class CommentMixin:
             'blog:post_detail',
             kwargs={'post_id': self.kwargs['post_id']}
         )
+
+
+class CursorPaginationMixin:
+    cursor_ordering = ('-pub_date', '-pk')
+
+    def paginate_queryset(self, queryset, page_size):
+        if settings.BLOG_FEED_PAGINATION != 'cursor':
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(queryset, page_size, self.cursor_ordering)
+        page = paginator.get_page(self.request.GET.get('cursor'))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class StreamingListMixin:
+    def render_to_response(self, context, **response_kwargs):
+        if not settings.BLOG_STREAMING_LIST_PAGES:
+            return super().render_to_response(context, **response_kwargs)
+        return render_streaming(
+            self.request, self.get_template_names()[0], context
+        )
@@ -1,7 +1,15 @@
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.db.models.query import ModelIterable
+from django.utils import timezone
 
 from blog.constant import HEADER_MODEL_LEN, LEN_ADMIN_POST
+from blog.images import get_srcsets
+from blog.lookups import categories, locations
 from core.models import PublishedModel
 
 User = get_user_model()
@@ -38,6 +46,102 @@ class Category(PublishedModel, models.Model):
         return self.title[:HEADER_MODEL_LEN]
 
 
+def published_now():
+    """Current time rounded down to BLOG_PUBLISHED_NOW_GRANULARITY seconds.
+
+    Within one window every feed query gets the same parameters, so the
+    database and the application can reuse cached results.
+    """
+    now = timezone.now()
+    granularity = settings.BLOG_PUBLISHED_NOW_GRANULARITY
+    if not granularity:
+        return now
+    return now - timedelta(seconds=now.timestamp() % granularity)
+
+
+class LookupIterable(ModelIterable):
+    """Attach category and location from the lookup tables, not joins."""
+
+    lookups = (("category", categories), ("location", locations))
+
+    def __iter__(self):
+        for post in super().__iter__():
+            for name, table in self.lookups:
+                field = post._meta.get_field(name)
+                related = table.get(getattr(post, field.attname))
+                if related is not None:
+                    field.set_cached_value(post, related)
+            yield post
+
+
+class CommentCountIterable(LookupIterable):
+    """Lookups plus comment counts, read for the fetched rows at once.
+
+    One ``GROUP BY post_id`` query per chunk of fetched rows replaces
+    the stored ``comment_count`` values, so iterator() keeps its memory
+    bound.
+    """
+
+    def get_counts(self, posts):
+        return dict(
+            Comment.objects.using(self.queryset.db)
+            .filter(post_id__in=[post.pk for post in posts])
+            .order_by()
+            .values("post")
+            .annotate(total=models.Count("pk"))
+            .values_list("post", "total")
+        )
+
+    def __iter__(self):
+        rows = super().__iter__()
+        while True:
+            posts = list(islice(rows, self.chunk_size))
+            if not posts:
+                return
+            counts = self.get_counts(posts)
+            for post in posts:
+                post.comment_count = counts.get(post.pk, 0)
+                yield post
+
+
+class PostQuerySet(models.QuerySet):
+    def published(self, now=None):
+        return self.filter(
+            is_published=True,
+            category_id__in=categories.published_ids(),
+            pub_date__lte=now or published_now(),
+        )
+
+    def with_lookups(self):
+        clone = self._chain()
+        clone._iterable_class = LookupIterable
+        return clone
+
+    def with_comment_counts(self):
+        """with_lookups() that also counts the comments of fetched posts."""
+        clone = self._chain()
+        clone._iterable_class = CommentCountIterable
+        return clone
+
+    def for_cards(self):
+        """Posts as the post cards show them.
+
+        Comment counts come from the stored column or, with
+        BLOG_COMMENT_COUNTS = 'prefetch', from one query per page.
+        """
+        posts = self.select_related("author")
+        if settings.BLOG_COMMENT_COUNTS == "prefetch":
+            return posts.with_comment_counts()
+        return posts.with_lookups()
+
+    def for_profile(self, author, viewer=None, now=None):
+        """Posts on the author's page: all of them for the author."""
+        posts = self.filter(author=author)
+        if viewer is None or viewer.pk != author.pk:
+            posts = posts.published(now)
+        return posts
+
+
 class Post(PublishedModel, models.Model):
     title = models.CharField("Заголовок", max_length=256)
     text = models.TextField(
@@ -69,16 +173,57 @@ class Post(PublishedModel, models.Model):
     image = models.ImageField(
         verbose_name="Фото", upload_to="post_images", blank=True
     )
+    image_variants = models.JSONField(
+        "Уменьшенные копии фото", default=dict, editable=False
+    )
+    comment_count = models.PositiveIntegerField(
+        "Количество комментариев", default=0, editable=False
+    )
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         verbose_name = "публикация"
         verbose_name_plural = "Публикации"
         default_related_name = "posts"
         ordering = ["-pub_date"]
+        indexes = [
+            models.Index(
+                fields=["is_published", "pub_date"],
+                name="post_published_pub_date_idx",
+            ),
+            models.Index(
+                fields=["category", "pub_date"],
+                name="post_category_pub_date_idx",
+            ),
+            models.Index(
+                fields=["author", "pub_date"],
+                name="post_author_pub_date_idx",
+            ),
+            models.Index(
+                fields=["pub_date"],
+                condition=models.Q(is_published=True),
+                name="post_feed_pub_date_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title[:HEADER_MODEL_LEN]
 
+    @property
+    def image_srcsets(self):
+        """Map file extension to the srcset of the resized copies."""
+        return get_srcsets(self.image, self.image_variants)
+
+    def is_visible(self, now=None):
+        """Python twin of PostQuerySet.published() for a loaded post."""
+        return (
+            self.is_published
+            and self.category is not None
+            and self.category.is_published
+            and self.pub_date <= (now or published_now())
+        )
+
 
 class Comment(PublishedModel, models.Model):
     text = models.TextField("Текс коментария")
@@ -96,8 +241,60 @@ class Comment(PublishedModel, models.Model):
         verbose_name_plural = "Коментарии"
         default_related_name = "comments"
         ordering = ["created_at"]
+        indexes = [
+            models.Index(
+                fields=["post", "created_at"],
+                name="comment_post_created_at_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"""Комментарий: {self.text[:LEN_ADMIN_POST]}
                 от автора: {self.author}
                 к публикации: "{self.post.title} """
+
+
+class FeedEntryQuerySet(models.QuerySet):
+    def visible(self, feed, now=None):
+        return self.filter(
+            feed=feed,
+            category_id__in=categories.published_ids(),
+            pub_date__lte=now or published_now(),
+        ).order_by("-pub_date", "-post_id")
+
+
+class FeedEntry(models.Model):
+    """Post id in a category or author feed, pre-sorted by pub_date.
+
+    Entries exist for every published post, scheduled ones included;
+    reads cut them at "now" and at the published categories.
+    """
+
+    feed = models.CharField("Лента", max_length=64)
+    post = models.ForeignKey(
+        Post, on_delete=models.CASCADE, related_name="feed_entries"
+    )
+    category = models.ForeignKey(
+        Category, on_delete=models.SET_NULL, null=True, related_name="+"
+    )
+    pub_date = models.DateTimeField("Дата и время публикации")
+
+    objects = FeedEntryQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "запись ленты"
+        verbose_name_plural = "Записи лент"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["feed", "post"], name="feed_entry_unique_post"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["feed", "-pub_date", "-post"],
+                name="feed_entry_feed_pub_date_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.feed}: {self.post_id}"
@@ -0,0 +1,225 @@
+import base64
+import json
+from collections.abc import Sequence
+from types import SimpleNamespace
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Min, Q
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from blog.cache import (ALL_PAGES_TAG, aget_page_tag_versions,
+                        get_next_pub_date_query, get_page_tag_versions,
+                        shared_cache)
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator whose ``count`` is shared between requests.
+
+    Counts are cached under the versions of the page tags of the list,
+    so the signals that make the cached pages stale drop the count too.
+    A count is also dropped once the next scheduled post goes live, and
+    lives at most BLOG_PAGINATOR_COUNT_TIMEOUT. On PostgreSQL, lists the
+    planner expects to hold more than BLOG_PAGINATOR_ESTIMATE_THRESHOLD
+    rows take the estimate instead of COUNT(*), and ``approximate`` is
+    set.
+    """
+
+    def __init__(self, object_list, per_page, *args, tags=(), **kwargs):
+        super().__init__(object_list, per_page, *args, **kwargs)
+        self.tags = [ALL_PAGES_TAG, *tags]
+        self.approximate = False
+
+    def _get_count_key(self, versions):
+        parts = [*self.tags, *map(str, versions)]
+        return f'paginator_count:{":".join(parts)}'
+
+    def estimate_count(self):
+        """Planner row estimate, or None when it is missing or small."""
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return None
+        sql, params = (
+            queryset.order_by().query.get_compiler(queryset.db).as_sql()
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        rows = int(plan[0]['Plan']['Plan Rows'])
+        if rows < settings.BLOG_PAGINATOR_ESTIMATE_THRESHOLD:
+            return None
+        return rows
+
+    def _count_rows(self):
+        now = timezone.now()
+        valid_until = get_next_pub_date_query(now).aggregate(
+            next_pub_date=Min('pub_date')
+        )['next_pub_date']
+        estimate = self.estimate_count()
+        if estimate is not None:
+            return estimate, True, valid_until
+        return super().count, False, valid_until
+
+    def _is_fresh(self, cached):
+        if cached is None:
+            return False
+        valid_until = cached[2]
+        return valid_until is None or timezone.now() < valid_until
+
+    @cached_property
+    def count(self):
+        key = self._get_count_key(get_page_tag_versions(self.tags))
+        cached = shared_cache().get(key)
+        if not self._is_fresh(cached):
+            cached = self._count_rows()
+            shared_cache().set(
+                key, cached, settings.BLOG_PAGINATOR_COUNT_TIMEOUT
+            )
+        count, self.approximate, _ = cached
+        return count
+
+    async def acount(self):
+        key = self._get_count_key(await aget_page_tag_versions(self.tags))
+        cached = await shared_cache().aget(key)
+        if not self._is_fresh(cached):
+            cached = await sync_to_async(self._count_rows)()
+            await shared_cache().aset(
+                key, cached, settings.BLOG_PAGINATOR_COUNT_TIMEOUT
+            )
+        self.count, self.approximate, _ = cached
+        return self.count
+
+
+class CursorPage(Sequence):
+    def __init__(self, object_list, paginator, next_cursor=None,
+                 previous_cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f'<Cursor page of {len(self.object_list)} items>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Keyset pagination over a fixed ordering.
+
+    Pages are addressed by an opaque cursor holding the ordering values
+    of the boundary row, so every page is a single indexed range read
+    without OFFSET and without COUNT(*).
+    """
+
+    cursor_based = True
+
+    def __init__(self, queryset, per_page, ordering=('-pub_date', '-pk')):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self._fields = [
+            (name.lstrip('-'), name.startswith('-')) for name in ordering
+        ]
+
+    def _get_field(self, name):
+        meta = self.queryset.model._meta
+        return meta.pk if name == 'pk' else meta.get_field(name)
+
+    def encode_cursor(self, obj, forward):
+        if isinstance(obj, dict):
+            # A values() row; it has to include the ordering fields.
+            obj = SimpleNamespace(**obj)
+        values = [
+            self._get_field(name).value_to_string(obj)
+            for name, _ in self._fields
+        ]
+        payload = json.dumps(['n' if forward else 'p', values])
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, cursor):
+        try:
+            direction, values = json.loads(base64.urlsafe_b64decode(cursor))
+            if direction not in ('n', 'p') or len(values) != len(self._fields):
+                raise ValueError
+            values = [
+                self._get_field(name).to_python(value)
+                for (name, _), value in zip(self._fields, values)
+            ]
+        except Exception:
+            return None
+        return direction == 'n', values
+
+    def _seek(self, values, forward):
+        condition = Q()
+        for position in reversed(range(len(self._fields))):
+            name, descending = self._fields[position]
+            lookup = 'lt' if descending == forward else 'gt'
+            step = Q(**{f'{name}__{lookup}': values[position]})
+            if condition:
+                step |= Q(**{name: values[position]}) & condition
+            condition = step
+        return self.queryset.filter(condition)
+
+    def _reversed_ordering(self):
+        return [
+            name if descending else f'-{name}'
+            for name, descending in self._fields
+        ]
+
+    def _get_query(self, cursor):
+        decoded = self.decode_cursor(cursor) if cursor else None
+        if decoded is None:
+            return self.queryset.order_by(*self.ordering), None
+        forward, values = decoded
+        if forward:
+            queryset = self._seek(values, forward=True).order_by(
+                *self.ordering)
+        else:
+            queryset = self._seek(values, forward=False).order_by(
+                *self._reversed_ordering())
+        return queryset, forward
+
+    def _make_page(self, rows, forward):
+        if forward is None:
+            has_more, has_before = len(rows) > self.per_page, False
+        else:
+            has_more, has_before = len(rows) > self.per_page, True
+            if not forward:
+                rows = rows[:self.per_page][::-1]
+                has_more, has_before = True, has_more
+        rows = rows[:self.per_page]
+        next_cursor = previous_cursor = None
+        if rows and has_more:
+            next_cursor = self.encode_cursor(rows[-1], forward=True)
+        if rows and has_before:
+            previous_cursor = self.encode_cursor(rows[0], forward=False)
+        return CursorPage(rows, self, next_cursor, previous_cursor)
+
+    def get_page(self, cursor=None):
+        queryset, forward = self._get_query(cursor)
+        return self._make_page(list(queryset[:self.per_page + 1]), forward)
+
+    async def aget_page(self, cursor=None):
+        queryset, forward = self._get_query(cursor)
+        rows = [row async for row in queryset[:self.per_page + 1]]
+        return self._make_page(rows, forward)
@@ -0,0 +1,129 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+try:
+    import snowballstemmer
+except ImportError:
+    snowballstemmer = None
+
+SQLITE_TABLE = 'blog_post_fts'
+POSTGRES_TABLE = 'blog_post_search'
+WORD_RE = re.compile(r'\w+')
+# Field weights: title, text, location, author.
+SQLITE_WEIGHTS = (10.0, 1.0, 2.0, 2.0)
+POSTGRES_WEIGHTS = ('A', 'B', 'C', 'C')
+
+
+def stem_words(text):
+    words = WORD_RE.findall(text.lower())
+    if snowballstemmer is None:
+        return words
+    return snowballstemmer.stemmer('russian').stemWords(words)
+
+
+def get_post_fields(title, text, location_name, author_username):
+    return [title, text, location_name or '', author_username]
+
+
+def write_document(cursor, post_id, fields):
+    vendor = cursor.db.vendor
+    if vendor == 'sqlite':
+        cursor.execute(
+            f'DELETE FROM {SQLITE_TABLE} WHERE rowid = %s', [post_id]
+        )
+        cursor.execute(
+            f'INSERT INTO {SQLITE_TABLE} '
+            '(rowid, title, text, location, author) '
+            'VALUES (%s, %s, %s, %s, %s)',
+            [post_id] + [' '.join(stem_words(field)) for field in fields],
+        )
+    elif vendor == 'postgresql':
+        document = ' || '.join(
+            f"setweight(to_tsvector('russian', %s), '{weight}')"
+            for weight in POSTGRES_WEIGHTS
+        )
+        cursor.execute(
+            f'INSERT INTO {POSTGRES_TABLE} (post_id, document) '
+            f'VALUES (%s, {document}) ON CONFLICT (post_id) '
+            'DO UPDATE SET document = EXCLUDED.document',
+            [post_id] + fields,
+        )
+
+
+def index_post(post):
+    fields = get_post_fields(
+        post.title,
+        post.text,
+        post.location.name if post.location_id else '',
+        post.author.username,
+    )
+    with connection.cursor() as cursor:
+        write_document(cursor, post.pk, fields)
+
+
+def index_posts(posts):
+    for post in posts.select_related('location', 'author').iterator():
+        index_post(post)
+
+
+def remove_post(post_id):
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(
+                f'DELETE FROM {SQLITE_TABLE} WHERE rowid = %s', [post_id]
+            )
+        elif connection.vendor == 'postgresql':
+            cursor.execute(
+                f'DELETE FROM {POSTGRES_TABLE} WHERE post_id = %s', [post_id]
+            )
+
+
+def get_match_expression(query):
+    return ' '.join(
+        '"{}"*'.format(word.replace('"', '""'))
+        for word in stem_words(query)
+    )
+
+
+def search_posts(queryset, query, ranked=True):
+    """Filter posts by the full-text index, best matches first."""
+    table = queryset.model._meta.db_table
+    if connection.vendor == 'sqlite':
+        expression = get_match_expression(query)
+        if not expression:
+            return queryset.none()
+        matches = RawSQL(
+            f'SELECT rowid FROM {SQLITE_TABLE} '
+            f'WHERE {SQLITE_TABLE} MATCH %s',
+            [expression],
+        )
+        rank = RawSQL(
+            f'SELECT bm25({SQLITE_TABLE}, %s, %s, %s, %s) '
+            f'FROM {SQLITE_TABLE} WHERE {SQLITE_TABLE} MATCH %s '
+            f'AND rowid = {table}.id',
+            [*SQLITE_WEIGHTS, expression],
+        )
+        ordering = ('search_rank', '-pub_date')
+    elif connection.vendor == 'postgresql':
+        matches = RawSQL(
+            f'SELECT post_id FROM {POSTGRES_TABLE} '
+            "WHERE document @@ plainto_tsquery('russian', %s)",
+            [query],
+        )
+        rank = RawSQL(
+            f"SELECT ts_rank(document, plainto_tsquery('russian', %s)) "
+            f'FROM {POSTGRES_TABLE} WHERE post_id = {table}.id',
+            [query],
+        )
+        ordering = ('-search_rank', '-pub_date')
+    else:
+        return queryset.filter(
+            Q(title__icontains=query) | Q(text__icontains=query)
+        )
+    queryset = queryset.filter(pk__in=matches)
+    if not ranked:
+        return queryset
+    return queryset.annotate(search_rank=rank).order_by(*ordering)
@@ -1,16 +1,178 @@
-from django.utils import timezone
+from django.contrib.auth import get_user_model
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.http import Http404
+from django.shortcuts import get_object_or_404
 
-from blog.models import Post
+from blog.constant import COMMENTS_PER_PAGE, POST_PER_PAGE
+from blog.models import Comment, FeedEntry, Post
+from blog.paginator import CachedCountPaginator, CursorPaginator
 
+User = get_user_model()
 
-def get_base_request():
-    current_date = timezone.now()
+
+def get_base_request(now=None):
     return (
-        Post.objects.select_related("category", "author", "location")
-        .filter(
-            is_published=True,
-            category__is_published=True,
-            pub_date__lte=current_date
-        )
+        Post.objects.published(now)
+        .for_cards()
         .order_by("-pub_date")
     )
+
+
+def get_feed_entries(feed):
+    return FeedEntry.objects.visible(feed).values_list('post_id', flat=True)
+
+
+def get_feed_posts():
+    return Post.objects.for_cards()
+
+
+def get_post_paginator(queryset, *tags):
+    """Numbered pages of posts, counted once per change of the tags."""
+    return CachedCountPaginator(queryset, POST_PER_PAGE, tags=tags)
+
+
+def get_feed_page(feed, page_number, count=None, tags=()):
+    """Page of a materialized feed: an index range read, then the posts."""
+    paginator = get_post_paginator(get_feed_entries(feed), *tags)
+    if count is not None:
+        paginator.count = count
+    page = paginator.get_page(page_number)
+    post_ids = list(page.object_list)
+    posts = get_feed_posts().in_bulk(post_ids)
+    page.object_list = [posts[pk] for pk in post_ids if pk in posts]
+    return page
+
+
+async def aget_page(queryset, page_number, count=None, tags=()):
+    """Async twin of Paginator.get_page() that reads the rows up front."""
+    paginator = get_post_paginator(queryset, *tags)
+    if count is None:
+        await paginator.acount()
+    else:
+        paginator.count = count
+    page = paginator.get_page(page_number)
+    page.object_list = [obj async for obj in page.object_list]
+    return page
+
+
+async def aget_feed_page(feed, page_number, count=None, tags=()):
+    page = await aget_page(get_feed_entries(feed), page_number, count, tags)
+    posts = await get_feed_posts().ain_bulk(page.object_list)
+    page.object_list = [
+        posts[pk] for pk in page.object_list if pk in posts
+    ]
+    return page
+
+
+def get_last_published_query(category_slug=None, username=None):
+    posts = Post.objects.published()
+    if category_slug is not None:
+        posts = posts.filter(category__slug=category_slug)
+    if username is not None:
+        posts = posts.filter(author__username=username)
+    return posts
+
+
+def get_last_published(category_slug=None, username=None):
+    return get_last_published_query(category_slug, username).aggregate(
+        last_published=Max('pub_date')
+    )['last_published']
+
+
+async def aget_last_published(category_slug=None, username=None):
+    return (await get_last_published_query(category_slug, username).aaggregate(
+        last_published=Max('pub_date')
+    ))['last_published']
+
+
+def count_by_author(queryset):
+    return Coalesce(
+        Subquery(
+            queryset.filter(author=OuterRef('pk'))
+            .order_by()
+            .values('author')
+            .annotate(total=Count('pk'))
+            .values('total')
+        ),
+        0,
+    )
+
+
+def get_profile_query(username, viewer):
+    posts = Post.objects.all()
+    if viewer.username != username:
+        posts = Post.objects.published()
+    return User.objects.annotate(
+        post_count=count_by_author(posts),
+        comment_count=count_by_author(Comment.objects.all()),
+    )
+
+
+def get_profile_or_404(username, viewer):
+    """Fetch the profile owner together with the header stats.
+
+    ``post_count`` counts the posts the viewer can see on the page, so it
+    also serves as the paginator count.
+    """
+    return get_object_or_404(
+        get_profile_query(username, viewer), username=username
+    )
+
+
+async def aget_profile_or_404(username, viewer):
+    try:
+        return await get_profile_query(username, viewer).aget(
+            username=username
+        )
+    except User.DoesNotExist:
+        raise Http404
+
+
+def check_post_visible(post, user):
+    if post.author_id != user.id and not post.is_visible():
+        raise Http404
+    return post
+
+
+def get_post_for_user_or_404(user, post_id, queryset=Post.objects):
+    return check_post_visible(get_object_or_404(queryset, pk=post_id), user)
+
+
+async def aget_post_for_user_or_404(user, post_id, queryset=Post.objects):
+    try:
+        post = await queryset.aget(pk=post_id)
+    except Post.DoesNotExist:
+        raise Http404
+    return check_post_visible(post, user)
+
+
+def get_comments_paginator(post):
+    return CursorPaginator(
+        post.comments.select_related('author'),
+        COMMENTS_PER_PAGE,
+        ordering=('created_at', 'pk'),
+    )
+
+
+def get_comments_page(post, cursor=None):
+    return get_comments_paginator(post).get_page(cursor)
+
+
+def recount_comments(posts=None):
+    actual_count = Coalesce(
+        Subquery(
+            Comment.objects.filter(post=OuterRef('pk'))
+            .order_by()
+            .values('post')
+            .annotate(total=Count('pk'))
+            .values('total')
+        ),
+        0,
+    )
+    if posts is None:
+        posts = Post.objects.all()
+    return (
+        posts.exclude(comment_count=actual_count)
+        .update(comment_count=actual_count)
+    )
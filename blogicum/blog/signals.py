@@ -0,0 +1,187 @@
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from blog.cache import (ALL_PAGES_TAG, forget_all_post_cards,
+                        forget_post_card, get_post_page_tags, touch_page_tags)
+from blog.lookups import categories, locations
+from blog.materialized import refresh_feed_entries
+from blog.models import Category, Comment, Location, Post
+from core.jobs import enqueue
+
+User = get_user_model()
+
+
+def touch_post_pages(post_id):
+    post = (
+        Post.objects.select_related('author', 'category')
+        .only('author__username', 'category__slug')
+        .filter(pk=post_id).first()
+    )
+    if post is not None:
+        touch_page_tags(*get_post_page_tags(post))
+
+
+def change_comment_count(post_id, delta):
+    Post.objects.filter(pk=post_id).update(
+        comment_count=F('comment_count') + delta
+    )
+    transaction.on_commit(partial(forget_post_card, post_id))
+    transaction.on_commit(partial(touch_post_pages, post_id))
+
+
+@receiver(post_init, sender=Comment)
+def remember_comment_post(sender, instance, **kwargs):
+    instance._saved_post_id = instance.post_id
+
+
+def touch_commenter_profile(comment):
+    # The commenter's profile shows their comment count.
+    transaction.on_commit(
+        partial(touch_page_tags, f'profile:{comment.author.username}')
+    )
+
+
+@receiver(post_save, sender=Comment)
+def count_saved_comment(sender, instance, created, **kwargs):
+    previous_post_id = instance._saved_post_id
+    if created:
+        change_comment_count(instance.post_id, 1)
+        touch_commenter_profile(instance)
+    elif previous_post_id and previous_post_id != instance.post_id:
+        change_comment_count(previous_post_id, -1)
+        change_comment_count(instance.post_id, 1)
+        touch_commenter_profile(instance)
+        enqueue('blog.recount_comments', post_id=previous_post_id)
+    else:
+        transaction.on_commit(
+            partial(touch_page_tags, f'post:{instance.post_id}')
+        )
+    instance._saved_post_id = instance.post_id
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, **kwargs):
+    Post.objects.filter(pk=instance.post_id, comment_count__gt=0).update(
+        comment_count=F('comment_count') - 1
+    )
+    transaction.on_commit(partial(forget_post_card, instance.post_id))
+    transaction.on_commit(partial(touch_post_pages, instance.post_id))
+    touch_commenter_profile(instance)
+    enqueue('blog.recount_comments', post_id=instance.post_id)
+
+
+@receiver(post_init, sender=Post)
+def remember_post_owners(sender, instance, **kwargs):
+    instance._saved_category_id = instance.category_id
+    instance._saved_author_id = instance.author_id
+
+
+@receiver(post_save, sender=Post)
+def make_post_image_variants(sender, instance, **kwargs):
+    image_name = instance.image.name if instance.image else None
+    if instance.image_variants.get('name') != image_name:
+        enqueue('blog.make_image_variants', post_id=instance.pk)
+
+
+@receiver(post_delete, sender=Post)
+def delete_post_image_variants(sender, instance, **kwargs):
+    if instance.image_variants.get('widths'):
+        enqueue('blog.delete_image_variants',
+                variants=instance.image_variants)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def forget_changed_post_card(sender, instance, **kwargs):
+    # After commit: a reader that saw the old row before it would cache
+    # it again under the new key.
+    transaction.on_commit(partial(forget_post_card, instance.pk))
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def forget_post_pages(sender, instance, **kwargs):
+    tags = get_post_page_tags(instance)
+    if instance._saved_category_id not in (None, instance.category_id):
+        tags.extend(
+            f'category:{slug}' for slug in Category.objects.filter(
+                pk=instance._saved_category_id
+            ).values_list('slug', flat=True)
+        )
+    if instance._saved_author_id not in (None, instance.author_id):
+        tags.extend(
+            f'profile:{username}' for username in User.objects.filter(
+                pk=instance._saved_author_id
+            ).values_list('username', flat=True)
+        )
+    # After commit, like the post card (see forget_changed_post_card).
+    transaction.on_commit(partial(touch_page_tags, *tags))
+    instance._saved_category_id = instance.category_id
+    instance._saved_author_id = instance.author_id
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def forget_categories(sender, **kwargs):
+    # Connected before forget_post_cards: the tables must hold the new
+    # rows by the time the pages that show them go stale.
+    transaction.on_commit(categories.forget)
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def forget_locations(sender, **kwargs):
+    transaction.on_commit(locations.forget)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def forget_post_cards(sender, **kwargs):
+    transaction.on_commit(forget_all_post_cards)
+    transaction.on_commit(partial(touch_page_tags, ALL_PAGES_TAG))
+
+
+@receiver(post_save, sender=User)
+def forget_author_post_cards(sender, created, update_fields=None, **kwargs):
+    if created:
+        return
+    if update_fields is None or 'username' in update_fields:
+        transaction.on_commit(forget_all_post_cards)
+        transaction.on_commit(partial(touch_page_tags, ALL_PAGES_TAG))
+
+
+@receiver(post_save, sender=Post)
+def refresh_post_feed_entries(sender, instance, **kwargs):
+    refresh_feed_entries([instance])
+
+
+@receiver(post_save, sender=Post)
+def index_saved_post(sender, instance, **kwargs):
+    enqueue('blog.index_post', post_id=instance.pk)
+
+
+@receiver(post_delete, sender=Post)
+def remove_deleted_post(sender, instance, **kwargs):
+    enqueue('blog.remove_post', post_id=instance.pk)
+
+
+@receiver(post_save, sender=Location)
+def index_location_posts(sender, instance, created, **kwargs):
+    if not created:
+        enqueue('blog.index_location_posts', location_id=instance.pk)
+
+
+@receiver(post_save, sender=User)
+def index_author_posts(sender, instance, created, update_fields=None,
+                       **kwargs):
+    if created:
+        return
+    if update_fields is None or 'username' in update_fields:
+        enqueue('blog.index_author_posts', author_id=instance.pk)
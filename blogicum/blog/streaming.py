@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
+from django.template.loader import get_template, render_to_string
+from django.utils.safestring import mark_safe
+
+from core.db_routers import capture_read_routing
+
+STREAM_MARKER = mark_safe('<!-- posts -->')
+
+
+def render_streaming(request, template_name, context):
+    """Stream a post list page: chrome first, then cards one by one.
+
+    The page template is rendered with its ``posts`` block replaced by a
+    marker; everything before the marker is sent before the posts are
+    read from the database.
+    """
+    frame = render_to_string(
+        'blog/stream.html',
+        {
+            **context,
+            'list_template': template_name,
+            'stream_marker': STREAM_MARKER,
+        },
+        request,
+    )
+    head, tail = frame.split(STREAM_MARKER)
+    posts = context['page_obj'].object_list
+    if isinstance(posts, QuerySet):
+        posts = posts.iterator(
+            chunk_size=settings.BLOG_STREAMING_CHUNK_SIZE
+        )
+    item_template = get_template('includes/post_list_item.html')
+    read_routing = capture_read_routing()
+
+    def chunks():
+        yield head
+        with read_routing():
+            for post in posts:
+                yield item_template.render({'post': post})
+        yield tail
+
+    return StreamingHttpResponse(chunks())
@@ -0,0 +1,138 @@
+"""RSS and Atom versions of the index, category and profile feeds.
+
+The documents go through the same page cache and conditional GET as the
+HTML pages with the same tags, so a feed is rebuilt only after a post
+in it changes, and polling readers mostly get 304.
+"""
+from django.contrib.auth import get_user_model
+from django.contrib.syndication.views import Feed
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.decorators import method_decorator
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.text import Truncator
+
+from blog.cache import cache_anonymous_page
+from blog.conditional import conditional_page
+from blog.constant import FEED_ITEMS
+from blog.lookups import categories
+from blog.service import get_base_request, get_last_published
+from core.db_routers import read_from_replica
+
+User = get_user_model()
+DESCRIPTION_WORDS = 50
+
+
+class PostsFeed(Feed):
+    title = 'Блогикум'
+    description = 'Новые публикации'
+
+    def link(self):
+        return reverse('blog:index')
+
+    def get_posts(self, obj):
+        return get_base_request()
+
+    def items(self, obj):
+        return self.get_posts(obj)[:FEED_ITEMS]
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return Truncator(item.text).words(DESCRIPTION_WORDS)
+
+    def item_link(self, item):
+        return reverse('blog:post_detail', args=[item.pk])
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+    def item_author_name(self, item):
+        return item.author.username
+
+    def item_categories(self, item):
+        return [item.category.title] if item.category_id else []
+
+
+class AtomFeedMixin:
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self._get_dynamic_attr('description', obj)
+
+
+@method_decorator(read_from_replica(), name='__call__')
+@method_decorator(
+    conditional_page('feed', last_published=get_last_published),
+    name='__call__',
+)
+@method_decorator(cache_anonymous_page('feed'), name='__call__')
+class LatestPostsFeed(PostsFeed):
+    pass
+
+
+class LatestPostsAtomFeed(AtomFeedMixin, LatestPostsFeed):
+    pass
+
+
+@method_decorator(read_from_replica(), name='__call__')
+@method_decorator(
+    conditional_page('category:{category_slug}',
+                     last_published=get_last_published),
+    name='__call__',
+)
+@method_decorator(
+    cache_anonymous_page('category:{category_slug}'), name='__call__'
+)
+class CategoryPostsFeed(PostsFeed):
+    def get_object(self, request, category_slug):
+        category = categories.get_by('slug', category_slug)
+        if category is None or not category.is_published:
+            raise Http404
+        return category
+
+    def title(self, obj):
+        return f'Блогикум: {obj.title}'
+
+    def description(self, obj):
+        return obj.description
+
+    def link(self, obj):
+        return reverse('blog:category_posts', args=[obj.slug])
+
+    def get_posts(self, obj):
+        return get_base_request().filter(category_id=obj.pk)
+
+
+class CategoryPostsAtomFeed(AtomFeedMixin, CategoryPostsFeed):
+    pass
+
+
+@method_decorator(read_from_replica(), name='__call__')
+@method_decorator(
+    conditional_page('profile:{username}',
+                     last_published=get_last_published),
+    name='__call__',
+)
+@method_decorator(cache_anonymous_page('profile:{username}'), name='__call__')
+class AuthorPostsFeed(PostsFeed):
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def title(self, obj):
+        return f'Блогикум: публикации {obj.username}'
+
+    def description(self, obj):
+        return f'Новые публикации пользователя {obj.username}'
+
+    def link(self, obj):
+        return reverse('blog:profile', args=[obj.username])
+
+    def get_posts(self, obj):
+        return get_base_request().filter(author=obj)
+
+
+class AuthorPostsAtomFeed(AtomFeedMixin, AuthorPostsFeed):
+    pass
@@ -0,0 +1,52 @@
+from django import template
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from blog.cache import get_post_card, get_post_cards, set_post_card
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_cards(posts):
+    """Read the cached cards of a list at once for the post_card tags.
+
+    Use as ``{% post_cards page_obj as post_cards %}`` before the loop.
+    """
+    generation, cards = get_post_cards([post.pk for post in posts])
+    return {'generation': generation, 'cards': cards}
+
+
+@register.simple_tag(takes_context=True)
+def post_card(context, post):
+    prefetched = context.get('post_cards')
+    if prefetched is None:
+        generation, html = None, get_post_card(post.pk)
+    else:
+        generation = prefetched['generation']
+        html = prefetched['cards'].get(post.pk)
+    if html is None:
+        html = render_to_string('includes/post_card.html', {'post': post})
+        set_post_card(post.pk, html, generation)
+    return mark_safe(html)
+
+
+@register.simple_tag
+def page_range(page_obj):
+    """Page numbers around the current page and at both ends.
+
+    Gaps are Paginator.ELLIPSIS, so large lists render a few links
+    instead of one per page. When the count is an estimate, the pages past
+    the window are left out: they may not exist.
+    """
+    paginator = page_obj.paginator
+    pages = paginator.get_elided_page_range(
+        page_obj.number, on_each_side=2, on_ends=1
+    )
+    if not getattr(paginator, 'approximate', False):
+        return pages
+    last = page_obj.number + 2
+    return [
+        page for page in pages
+        if page == paginator.ELLIPSIS or page <= last
+    ]
@@ -1,24 +1,56 @@
+from django.conf import settings
 from django.urls import path
 
+from blog import api, async_views
+from blog.syndication import (AuthorPostsAtomFeed, AuthorPostsFeed,
+                              CategoryPostsAtomFeed, CategoryPostsFeed,
+                              LatestPostsAtomFeed, LatestPostsFeed)
 from blog.views import (CommentCreateView, CommentDeleteView,
                         CommentUpdateView, CreatePost, EditProfile, GetProfile,
                         IndexList, PostDeleteView, PostDetail, PostEdit,
-                        category_posts)
+                        category_posts, post_comments, search)
 
 app_name = 'blog'
 
+
+def select_view(name, view, async_view):
+    """Serve the route with its async variant if BLOG_ASYNC_VIEWS lists it."""
+    return async_view if name in settings.BLOG_ASYNC_VIEWS else view
+
+
 urlpatterns = [
-    path('', IndexList.as_view(), name='index'),
-    path('posts/<int:post_id>/', PostDetail.as_view(), name='post_detail'),
+    path('',
+         select_view('index', IndexList.as_view(), async_views.index),
+         name='index'),
+    path('posts/<int:post_id>/',
+         select_view('post_detail', PostDetail.as_view(),
+                     async_views.post_detail),
+         name='post_detail'),
     path('posts/create/', CreatePost.as_view(), name='create_post'),
     path('posts/<int:post_id>/edit/', PostEdit.as_view(), name='edit_post'),
     path('posts/<int:post_id>/delete/',
          PostDeleteView.as_view(),
          name='delete_post'),
-    path('category/<slug:category_slug>/', category_posts,
+    path('category/<slug:category_slug>/',
+         select_view('category_posts', category_posts,
+                     async_views.category_posts),
          name='category_posts'),
-    path('profile/<str:username>/', GetProfile.as_view(), name='profile'),
+    path('category/<slug:category_slug>/rss/', CategoryPostsFeed(),
+         name='category_rss'),
+    path('category/<slug:category_slug>/atom/', CategoryPostsAtomFeed(),
+         name='category_atom'),
+    path('feeds/rss/', LatestPostsFeed(), name='rss'),
+    path('feeds/atom/', LatestPostsAtomFeed(), name='atom'),
+    path('search/', search, name='search'),
+    path('profile/<str:username>/',
+         select_view('profile', GetProfile.as_view(), async_views.profile),
+         name='profile'),
+    path('profile/<str:username>/rss/', AuthorPostsFeed(),
+         name='profile_rss'),
+    path('profile/<str:username>/atom/', AuthorPostsAtomFeed(),
+         name='profile_atom'),
     path('edit_profile/', EditProfile.as_view(), name='edit_profile'),
+    path('posts/<int:post_id>/comments/', post_comments, name='comments'),
     path('posts/<int:post_id>/comment/',
          CommentCreateView.as_view(),
          name='add_comment'),
@@ -28,4 +60,10 @@ urlpatterns = [
     path('posts/<int:post_id>/delete_comment/<int:comment_id>/',
          CommentDeleteView.as_view(),
          name='delete_comment'),
+    path('api/posts/', api.post_list, name='api_posts'),
+    path('api/posts/<int:post_id>/', api.post_detail, name='api_post'),
+    path('api/posts/<int:post_id>/comments/', api.comment_list,
+         name='api_comments'),
+    path('api/categories/', api.category_list, name='api_categories'),
+    path('api/locations/', api.location_list, name='api_locations'),
 ]
@@ -1,9 +1,12 @@
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.models import User
 from django.core.paginator import Paginator
-from django.db.models import Count
+from django.http import Http404
 from django.shortcuts import get_object_or_404, render
 from django.urls import reverse
+from django.utils.http import urlencode
+from django.utils.decorators import method_decorator
 from django.views.generic import (
     DeleteView,
     DetailView,
@@ -12,38 +15,86 @@ from django.views.generic import (
 )
 from django.views.generic.edit import CreateView
 
+from blog.cache import cache_anonymous_page
+from blog.conditional import conditional_page
 from blog.constant import POST_PER_PAGE
 from blog.forms import CommentForm, PostForm
-from blog.mixin import CommentMixin, OnlyAuthorMixin
-from blog.models import Category, Post
-from blog.service import get_base_request
-
-
+from blog.mixin import (CommentMixin, CursorPaginationMixin, OnlyAuthorMixin,
+                        StreamingListMixin)
+from blog.lookups import categories
+from blog.materialized import author_feed, category_feed
+from blog.models import Post
+from blog.paginator import CachedCountPaginator
+from blog.search import search_posts
+from blog.service import (get_base_request, get_comments_page,
+                          get_feed_page, get_last_published,
+                          get_post_for_user_or_404, get_post_paginator,
+                          get_profile_or_404)
+from blog.streaming import render_streaming
+from core.db_routers import read_from_replica
+
+
+@read_from_replica()
+@conditional_page('category:{category_slug}',
+                  last_published=get_last_published)
+@cache_anonymous_page('category:{category_slug}')
 def category_posts(request, category_slug):
-    category = get_object_or_404(Category.objects.filter(is_published=True),
-                                 slug=category_slug)
+    category = categories.get_by('slug', category_slug)
+    if category is None or not category.is_published:
+        raise Http404
+    page_number = request.GET.get('page')
+    tag = f'category:{category_slug}'
+    if settings.BLOG_MATERIALIZED_FEEDS:
+        page_obj = get_feed_page(
+            category_feed(category.pk), page_number, tags=[tag]
+        )
+    else:
+        posts = get_base_request().filter(category_id=category.pk)
+        page_obj = get_post_paginator(posts, tag).get_page(page_number)
+    context = {'category': category, 'page_obj': page_obj}
+    if settings.BLOG_STREAMING_LIST_PAGES:
+        return render_streaming(request, 'blog/category.html', context)
+    return render(request, 'blog/category.html', context)
+
+
+@read_from_replica()
+def search(request):
+    query = request.GET.get('q', '').strip()
     posts = (
-        get_base_request()
-        .filter(category=category)
-        .annotate(comment_count=Count("comments"))
+        search_posts(get_base_request(), query)
+        if query else Post.objects.none()
     )
     paginator = Paginator(posts, POST_PER_PAGE)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
-    return render(request, 'blog/category.html',
-                  {'category': category, 'page_obj': page_obj})
-
-
-class IndexList(ListView):
+    page_obj = paginator.get_page(request.GET.get('page'))
+    return render(request, 'blog/search.html', {
+        'query': query,
+        'page_obj': page_obj,
+        'page_query': urlencode({'q': query}) + '&',
+    })
+
+
+@method_decorator(read_from_replica(), name='dispatch')
+@method_decorator(
+    conditional_page('feed', last_published=get_last_published),
+    name='dispatch',
+)
+@method_decorator(cache_anonymous_page('feed'), name='dispatch')
+class IndexList(CursorPaginationMixin, StreamingListMixin, ListView):
     template_name = 'blog/index.html'
     paginate_by = POST_PER_PAGE
+    paginator_class = CachedCountPaginator
     model = Post
-    queryset = get_base_request()
 
     def get_queryset(self):
-        return self.queryset.annotate(comment_count=Count('comments'))
+        return get_base_request()
+
+    def get_paginator(self, *args, **kwargs):
+        return super().get_paginator(*args, tags=['feed'], **kwargs)
 
 
+@method_decorator(read_from_replica(), name='dispatch')
+@method_decorator(conditional_page('post:{post_id}'), name='dispatch')
+@method_decorator(cache_anonymous_page('post:{post_id}'), name='dispatch')
 class PostDetail(DetailView):
     model = Post
     pk_url_kwarg = 'post_id'
@@ -53,16 +104,26 @@ class PostDetail(DetailView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['form'] = self.form_class()
-        context['comments'] = (
-            self.object.comments.select_related('author')
-        )
+        context['comments'] = get_comments_page(self.object)
         return context
 
-    def get_object(self):
-        obj = super().get_object()
-        if obj.author == self.request.user:
-            return obj
-        return get_object_or_404(get_base_request(), pk=self.kwargs['post_id'])
+    def get_object(self, queryset=None):
+        return get_post_for_user_or_404(
+            self.request.user,
+            self.kwargs['post_id'],
+            Post.objects.select_related('author').with_lookups(),
+        )
+
+
+@read_from_replica()
+@cache_anonymous_page('post:{post_id}')
+def post_comments(request, post_id):
+    post = get_post_for_user_or_404(
+        request.user, post_id, Post.objects.with_lookups()
+    )
+    comments = get_comments_page(post, request.GET.get('cursor'))
+    return render(request, 'includes/comment_list.html',
+                  {'post': post, 'comments': comments})
 
 
 class CreatePost(LoginRequiredMixin, CreateView):
@@ -96,12 +157,13 @@ class PostEdit(LoginRequiredMixin, OnlyAuthorMixin, UpdateView):
 class PostDeleteView(LoginRequiredMixin, OnlyAuthorMixin, DeleteView):
     model = Post
     pk_url_kwarg = 'post_id'
-    form_class = PostForm
     template_name = 'blog/create.html'
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['form'] = self.form_class(instance=self.get_object())
+        # The page shows the post in its edit form; deletion itself is
+        # confirmed by DeleteView's empty form.
+        context['form'] = PostForm(instance=self.object)
         return context
 
     def get_success_url(self):
@@ -128,35 +190,53 @@ class CommentDeleteView(LoginRequiredMixin,
                         OnlyAuthorMixin,
                         CommentMixin,
                         DeleteView):
-    pass
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        # blog/comment.html renders the comment form only when editing.
+        del context['form']
+        return context
 
 
-class GetProfile(ListView):
+@method_decorator(read_from_replica(), name='dispatch')
+@method_decorator(
+    conditional_page('profile:{username}', last_published=get_last_published),
+    name='dispatch',
+)
+@method_decorator(cache_anonymous_page('profile:{username}'), name='dispatch')
+class GetProfile(StreamingListMixin, ListView):
     template_name = 'blog/profile.html'
     model = Post
     paginate_by = POST_PER_PAGE
 
     def get_queryset(self):
-        user = get_object_or_404(User, username=self.kwargs['username'])
-        if self.request.user == user:
-            return (
-                Post.objects.filter(author=user)
-                .annotate(comment_count=Count("comments"))
-                .order_by("-pub_date")
-                .select_related("category", "author", "location")
-            )
+        self.profile = get_profile_or_404(
+            self.kwargs['username'], self.request.user
+        )
         return (
-            get_base_request()
-            .filter(
-                author=user,
-            )
-            .annotate(comment_count=Count("comments"))
+            Post.objects.for_profile(self.profile, self.request.user)
+            .for_cards()
+            .order_by('-pub_date')
         )
 
+    def paginate_queryset(self, queryset, page_size):
+        if (not settings.BLOG_MATERIALIZED_FEEDS
+                or self.profile.pk == self.request.user.pk):
+            return super().paginate_queryset(queryset, page_size)
+        page = get_feed_page(
+            author_feed(self.profile.pk),
+            self.request.GET.get('page'),
+            count=self.profile.post_count,
+        )
+        return page.paginator, page, page.object_list, page.has_other_pages()
+
+    def get_paginator(self, *args, **kwargs):
+        paginator = super().get_paginator(*args, **kwargs)
+        paginator.count = self.profile.post_count
+        return paginator
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        username = self.kwargs.get('username')
-        context['profile'] = get_object_or_404(User, username=username)
+        context['profile'] = self.profile
         return context
 
 
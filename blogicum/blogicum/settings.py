@@ -1,3 +1,5 @@
+import hashlib
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -23,6 +25,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.ReplicaStickinessMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -53,13 +56,112 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'blogicum.wsgi.application'
 
-DATABASES = {
-    'default': {
+# The database is chosen by environment variables: DB_ENGINE is 'sqlite'
+# (default) or 'postgresql'; the latter needs psycopg2 installed.
+DB_ENGINE = os.getenv('DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'postgresql':
+    DEFAULT_DATABASE = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.getenv('DB_NAME', 'blogicum'),
+        'USER': os.getenv('DB_USER', 'blogicum'),
+        'PASSWORD': os.getenv('DB_PASSWORD', ''),
+        'HOST': os.getenv('DB_HOST', 'localhost'),
+        'PORT': os.getenv('DB_PORT', '5432'),
+    }
+else:
+    DEFAULT_DATABASE = {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': os.getenv('DB_NAME', BASE_DIR / 'db.sqlite3'),
+    }
+# Keep connections open between requests; CONN_HEALTH_CHECKS (Django 4.1+)
+# replaces a connection that went away instead of failing the request.
+DEFAULT_DATABASE['CONN_MAX_AGE'] = int(os.getenv('DB_CONN_MAX_AGE', 60))
+DEFAULT_DATABASE['CONN_HEALTH_CHECKS'] = True
+
+DATABASES = {
+    'default': DEFAULT_DATABASE,
+}
+
+# Read-only views read from the replica when DB_REPLICA_HOST (PostgreSQL)
+# or DB_REPLICA_NAME (another SQLite file) is set. Locally, a copy of
+# db.sqlite3 works as a replica that never catches up.
+if os.getenv('DB_REPLICA_HOST') or os.getenv('DB_REPLICA_NAME'):
+    DATABASES['replica'] = {
+        **DEFAULT_DATABASE,
+        'HOST': os.getenv('DB_REPLICA_HOST', DEFAULT_DATABASE.get('HOST', '')),
+        'NAME': os.getenv('DB_REPLICA_NAME', DEFAULT_DATABASE['NAME']),
+        'TEST': {'MIRROR': 'default'},
     }
+
+DATABASE_ROUTERS = ['core.db_routers.ReplicaRouter']
+# After a POST the client reads from the primary for this many seconds,
+# so it sees its own writes despite replication lag.
+DB_REPLICA_STICKY_SECONDS = int(os.getenv('DB_REPLICA_STICKY_SECONDS', 10))
+
+# PRAGMAs run on every new SQLite connection (see core.db). WAL lets
+# readers proceed during a write; NORMAL syncs only at checkpoints.
+SQLITE_PRAGMAS = {
+    'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'WAL'),
+    'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL'),
+    'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', 64 * 1024 * 1024)),
+    # Negative values are KiB: 20 MB of page cache per connection.
+    'cache_size': int(os.getenv('SQLITE_CACHE_SIZE', -20000)),
+    'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT', 5000)),
 }
 
+PAGE_CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'pages',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('BLOG_PAGE_CACHE_DIR', BASE_DIR / 'page_cache'),
+    },
+}
+
+# The default cache is seen by every web and `run_jobs` process: 'file'
+# for one host, 'redis' (REDIS_URL) for several. 'locmem' is private to a
+# process and only fits a single-process setup such as the tests.
+CACHE_BACKENDS = {
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('CACHE_DIR', BASE_DIR / 'cache'),
+    },
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.getenv('REDIS_URL', 'redis://127.0.0.1:6379'),
+    },
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+}
+
+# Keys are prefixed with the database they describe, so two databases
+# (e.g. a benchmark's and the site's) never share cached rows or versions.
+CACHE_KEY_PREFIX = hashlib.md5('|'.join(map(str, (
+    DEFAULT_DATABASE['ENGINE'],
+    DEFAULT_DATABASE.get('HOST', ''),
+    DEFAULT_DATABASE['NAME'],
+))).encode()).hexdigest()[:12]
+
+CACHES = {
+    'default': {
+        **CACHE_BACKENDS[os.getenv('CACHE_BACKEND', 'file')],
+        'KEY_PREFIX': CACHE_KEY_PREFIX,
+    },
+    'pages': {
+        **PAGE_CACHE_BACKENDS[os.getenv('BLOG_PAGE_CACHE', 'locmem')],
+        'KEY_PREFIX': CACHE_KEY_PREFIX,
+    },
+}
+# Alias holding page tag versions, post cards, paginator counts and the
+# lookup tables; it must be shared between processes (see blog.checks).
+# Pages themselves may stay in a per-process cache, as their keys carry
+# the shared versions.
+BLOG_SHARED_CACHE = 'default'
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -99,3 +201,46 @@ MEDIA_ROOT = BASE_DIR / 'media'
 MEDIA_URL = 'media/'
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
+
+# 'page' — numbered pages, 'cursor' — keyset pagination by (pub_date, id).
+BLOG_FEED_PAGINATION = 'page'
+# Feed queries round "now" down to this many seconds, so identical queries
+# can be cached within the window. 0 disables rounding.
+BLOG_PUBLISHED_NOW_GRANULARITY = 0
+BLOG_POST_CARD_CACHE_TIMEOUT = 60 * 60
+# Category and location rows shared between workers (blog.lookups), and
+# their version, so a missed invalidation lasts at most this long.
+BLOG_LOOKUP_CACHE_TIMEOUT = 60 * 60 * 24
+# Anonymous full-page cache lifetime in seconds; 0 disables it.
+BLOG_PAGE_CACHE_TIMEOUT = 60 * 10
+# Stream list pages: page chrome first, then post cards as they are read.
+BLOG_STREAMING_LIST_PAGES = False
+BLOG_STREAMING_CHUNK_SIZE = 100
+# Paginator counts of the feed and category pages are cached this long
+# (blog.paginator.CachedCountPaginator). On PostgreSQL, lists estimated
+# above the threshold use the planner estimate instead of COUNT(*).
+BLOG_PAGINATOR_COUNT_TIMEOUT = 60 * 10
+BLOG_PAGINATOR_ESTIMATE_THRESHOLD = 100000
+# Comment counts on post cards: 'column' reads Post.comment_count kept by
+# signals, 'prefetch' counts the comments of each page in one query.
+BLOG_COMMENT_COUNTS = os.getenv('BLOG_COMMENT_COUNTS', 'column')
+# Category and public profile pages read post ids from the precomputed
+# blog.FeedEntry table (`manage.py rebuild_feeds` fills it).
+BLOG_MATERIALIZED_FEEDS = False
+# Route names served by native async views (blog.async_views), e.g.
+# BLOG_ASYNC_VIEWS=index,post_detail,category_posts,profile. Worth it
+# only under ASGI; under WSGI each async view gets its own event loop.
+BLOG_ASYNC_VIEWS = [
+    name for name in os.getenv('BLOG_ASYNC_VIEWS', '').split(',') if name
+]
+
+# Background jobs (core.jobs) are queued for `manage.py run_jobs`, which
+# must be running. Without a worker set JOBS_ALWAYS_EAGER=1: jobs then run
+# in the saving process once its transaction commits, and their errors are
+# logged instead of failing the request.
+JOBS_ALWAYS_EAGER = os.getenv('JOBS_ALWAYS_EAGER', '') == '1'
+# Seconds a claimed job stays locked before another worker may retry it.
+JOBS_VISIBILITY_TIMEOUT = 5 * 60
+JOBS_MAX_ATTEMPTS = 5
+# Delay before the first retry; doubled on each further attempt.
+JOBS_RETRY_DELAY = 30
@@ -0,0 +1,16 @@
+from django.contrib import admin
+
+from core.models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        'name',
+        'status',
+        'attempts',
+        'run_after',
+        'locked_until',
+    )
+    list_filter = ('status', 'name')
+    readonly_fields = ('created_at',)
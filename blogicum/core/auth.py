@@ -0,0 +1,13 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth.middleware import get_user
+
+
+async def aload_user(request):
+    """Resolve the lazy request.user in a worker thread.
+
+    Reading it may query the session and user tables, which async code
+    must not do directly.
+    """
+    if not hasattr(request, '_cached_user'):
+        request.user = await sync_to_async(get_user)(request)
+    return request.user
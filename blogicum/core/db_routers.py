@@ -0,0 +1,89 @@
+import asyncio
+from contextlib import ContextDecorator, contextmanager
+from contextvars import ContextVar
+from functools import partial, wraps
+
+from django.db import connections
+
+REPLICA_ALIAS = 'replica'
+
+reading_from_replica = ContextVar('reading_from_replica', default=False)
+pinned_to_primary = ContextVar('pinned_to_primary', default=False)
+
+
+class ReadFromReplica(ContextDecorator):
+    def __enter__(self):
+        self.token = reading_from_replica.set(True)
+
+    def __exit__(self, *exc_info):
+        reading_from_replica.reset(self.token)
+
+    def _recreate_cm(self):
+        # Each decorated call needs its own token.
+        return type(self)()
+
+    def __call__(self, func):
+        if not asyncio.iscoroutinefunction(func):
+            return super().__call__(func)
+
+        @wraps(func)
+        async def inner(*args, **kwargs):
+            with self._recreate_cm():
+                return await func(*args, **kwargs)
+        return inner
+
+
+def read_from_replica():
+    """Send reads made inside the block to the replica, when there is one.
+
+    Works as a decorator of sync and async views too:
+    ``@read_from_replica()``.
+    """
+    return ReadFromReplica()
+
+
+@contextmanager
+def pin_to_primary():
+    """Read from the primary inside the block, even in replica views."""
+    token = pinned_to_primary.set(True)
+    try:
+        yield
+    finally:
+        pinned_to_primary.reset(token)
+
+
+@contextmanager
+def _read_routing(reading, pinned):
+    reading_token = reading_from_replica.set(reading)
+    pinned_token = pinned_to_primary.set(pinned)
+    try:
+        yield
+    finally:
+        pinned_to_primary.reset(pinned_token)
+        reading_from_replica.reset(reading_token)
+
+
+def capture_read_routing():
+    """Context manager factory that brings back the current read routing.
+
+    Streamed responses read from the database after the view has
+    returned, outside its read_from_replica() and pin_to_primary() blocks.
+    """
+    return partial(
+        _read_routing, reading_from_replica.get(), pinned_to_primary.get()
+    )
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if (reading_from_replica.get() and not pinned_to_primary.get()
+                and REPLICA_ALIAS in connections.settings):
+            return REPLICA_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary.
+        return True
@@ -0,0 +1,115 @@
+import logging
+import traceback
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from core.models import Job
+
+logger = logging.getLogger(__name__)
+registry = {}
+
+
+def register(name):
+    """Register a function as the handler of the job called ``name``."""
+    def decorator(func):
+        registry[name] = func
+        return func
+    return decorator
+
+
+def run_eagerly(name, payload):
+    try:
+        registry[name](**payload)
+    except Exception:
+        logger.exception('Job %s failed with payload %r', name, payload)
+
+
+def enqueue(name, delay=0, **payload):
+    """Queue a job, or run it after commit when JOBS_ALWAYS_EAGER is set.
+
+    Jobs already waiting with the same name and payload are not duplicated,
+    so a burst of saves of one object costs a single run. An eager job
+    sees the committed data, and its failure is logged, not raised into
+    the save that enqueued it.
+    """
+    if settings.JOBS_ALWAYS_EAGER:
+        transaction.on_commit(partial(run_eagerly, name, payload))
+        return None
+    run_after = timezone.now() + timedelta(seconds=delay)
+    job = Job.objects.filter(
+        name=name, payload=payload, status=Job.PENDING
+    ).first()
+    if job is not None:
+        return job
+    return Job.objects.create(name=name, payload=payload, run_after=run_after)
+
+
+def get_available(now):
+    return Q(status=Job.PENDING, run_after__lte=now) | Q(
+        status=Job.RUNNING, locked_until__lt=now
+    )
+
+
+def claim_job(batch_size=10):
+    """Lock the next due job for this worker and return it.
+
+    A job is taken with a conditional UPDATE, so concurrent workers never
+    run it twice; a worker that dies leaves the lock to expire after
+    JOBS_VISIBILITY_TIMEOUT, when the job becomes available again.
+    """
+    now = timezone.now()
+    locked_until = now + timedelta(seconds=settings.JOBS_VISIBILITY_TIMEOUT)
+    candidates = Job.objects.filter(get_available(now)).values_list(
+        'pk', flat=True
+    )[:batch_size]
+    for pk in candidates:
+        claimed = Job.objects.filter(get_available(now), pk=pk).update(
+            status=Job.RUNNING,
+            locked_until=locked_until,
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return Job.objects.get(pk=pk)
+    return None
+
+
+def run_job(job):
+    """Run a claimed job; return True when it succeeded."""
+    owned = Job.objects.filter(
+        pk=job.pk, status=Job.RUNNING, locked_until=job.locked_until
+    )
+    try:
+        registry[job.name](**job.payload)
+    except Exception:
+        error = traceback.format_exc()
+        if job.attempts >= settings.JOBS_MAX_ATTEMPTS:
+            owned.update(status=Job.FAILED, locked_until=None,
+                         last_error=error)
+        else:
+            delay = settings.JOBS_RETRY_DELAY * 2 ** (job.attempts - 1)
+            owned.update(
+                status=Job.PENDING,
+                locked_until=None,
+                run_after=timezone.now() + timedelta(seconds=delay),
+                last_error=error,
+            )
+        return False
+    owned.delete()
+    return True
+
+
+def run_pending_jobs(limit=None):
+    """Run due jobs until the queue is empty; return the number processed."""
+    processed = 0
+    while limit is None or processed < limit:
+        job = claim_job()
+        if job is None:
+            break
+        run_job(job)
+        processed += 1
+    return processed
@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.jobs import run_pending_jobs
+
+
+class Command(BaseCommand):
+    help = 'Выполняет фоновые задачи из очереди.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Выполнить накопившиеся задачи и завершиться.')
+        parser.add_argument(
+            '--sleep', type=float, default=1,
+            help='Пауза в секундах, когда очередь пуста.')
+
+    def handle(self, *args, **options):
+        while True:
+            processed = run_pending_jobs()
+            if processed:
+                self.stdout.write(
+                    self.style.SUCCESS(f'Выполнено задач: {processed}')
+                )
+            if options['once']:
+                return
+            time.sleep(options['sleep'])
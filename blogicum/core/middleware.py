@@ -0,0 +1,32 @@
+from django.conf import settings
+
+from core.db_routers import pin_to_primary
+
+PRIMARY_COOKIE = 'read_primary'
+
+
+class ReplicaStickinessMiddleware:
+    """Keep a client on the primary for a while after it writes.
+
+    Replicas lag behind the primary, so right after a POST the author
+    would not see their own post or comment. A short-lived cookie sends
+    the reads of their next requests to the primary instead.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if PRIMARY_COOKIE in request.COOKIES:
+            with pin_to_primary():
+                response = self.get_response(request)
+        else:
+            response = self.get_response(request)
+        if request.method not in ('GET', 'HEAD', 'OPTIONS', 'TRACE'):
+            response.set_cookie(
+                PRIMARY_COOKIE, '1',
+                max_age=settings.DB_REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
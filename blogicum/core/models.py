@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 
 class PublishedModel(models.Model):
@@ -12,3 +13,38 @@ class PublishedModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class Job(models.Model):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (FAILED, 'Ошибка'),
+    )
+
+    name = models.CharField('Задача', max_length=100)
+    payload = models.JSONField('Аргументы', default=dict)
+    status = models.CharField(
+        'Статус', max_length=16, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField('Попыток', default=0)
+    run_after = models.DateTimeField('Не раньше', default=timezone.now)
+    locked_until = models.DateTimeField('Занята до', null=True, blank=True)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    created_at = models.DateTimeField('Добавлено', auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+        ordering = ('run_after',)
+        indexes = [
+            models.Index(
+                fields=['status', 'run_after'],
+                name='job_status_run_after_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.name} ({self.get_status_display()})'
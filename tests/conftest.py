@@ -15,10 +15,14 @@ from typing import (
     NamedTuple,
     TypeVar,
 )
+from unittest import mock
 
 import pytest
 from django.apps import apps
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import transaction
 from django.db.models import Model, Field
 from django.forms import BaseForm
 from django.http import HttpResponse
@@ -41,6 +45,60 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def run_jobs_eagerly():
+    with override_settings(JOBS_ALWAYS_EAGER=True):
+        yield
+
+
+@pytest.fixture(scope="session", autouse=True)
+def use_locmem_cache():
+    # The default cache is file based outside the tests; keep the test
+    # run, migrations included, in memory so it leaves nothing behind.
+    locmem = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    with override_settings(CACHES={**settings.CACHES, "default": locmem}):
+        yield
+
+
+@pytest.fixture
+def disable_page_cache():
+    with override_settings(BLOG_PAGE_CACHE_TIMEOUT=0):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def commit_test_level_changes():
+    # The test transaction is never committed. Treat its top level as
+    # autocommit, so on_commit callbacks registered outside inner atomic
+    # blocks run right away; those inside still wait for a real commit.
+    on_commit = transaction.on_commit
+
+    def run_on_commit(func, using=None, robust=False):
+        if not transaction.get_connection(using).savepoint_ids:
+            func()
+        else:
+            on_commit(func, using, robust)
+
+    with mock.patch.object(transaction, "on_commit", run_on_commit):
+        yield
+
+
+@pytest.fixture
+def settled_changes():
+    # Pages changed in the current second get no Last-Modified yet; put
+    # the clock past every change, whenever the test makes it.
+    with mock.patch("blog.conditional.time") as clock:
+        clock.time.return_value = float("inf")
+        yield
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    yield
+    for cache in caches.all():
+        cache.clear()
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -363,6 +421,7 @@ def cleanup(request):
                     filename.endswith(".jpg")
                     or filename.endswith(".gif")
                     or filename.endswith(".png")
+                    or filename.endswith(".webp")
             ):
                 file_path = os.path.join(root, filename)
                 if os.path.getmtime(file_path) >= start_time:
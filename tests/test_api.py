@@ -0,0 +1,139 @@
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog import api
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_json(client, url, status=200):
+    response = client.get(url)
+    assert response.status_code == status, url
+    assert response['Content-Type'] == 'application/json'
+    return json.loads(response.content)
+
+
+def test_post_list_pages_through_visible_posts(
+        client, many_posts_with_published_locations, future_posts,
+        unpublished_posts_with_published_locations):
+    expected_ids = [
+        post.id for post in sorted(
+            many_posts_with_published_locations,
+            key=lambda post: (post.pub_date, post.id), reverse=True,
+        )
+    ]
+    ids, url = [], '/api/posts/'
+    while url:
+        data = get_json(client, url)
+        assert len(data['results']) <= N_PER_PAGE
+        ids.extend(post['id'] for post in data['results'])
+        url = data['next']
+    assert ids == expected_ids, (
+        'Убедитесь, что API отдаёт опубликованные записи по одному разу, '
+        '«от новых к старым».'
+    )
+
+
+def test_post_fields(client, post_with_published_location):
+    post = post_with_published_location
+    data = get_json(client, f'/api/posts/{post.id}/')
+    assert set(data) == set(api.POSTS.fields)
+    assert data['author'] == post.author.username
+    assert data['category'] == post.category.slug
+    assert data['location'] == post.location.name
+
+
+def test_sparse_fieldsets(client, post_with_published_location):
+    with CaptureQueriesContext(connection) as queries:
+        data = get_json(client, '/api/posts/?fields=id,title')
+    assert data['results'] == [{
+        'id': post_with_published_location.id,
+        'title': post_with_published_location.title,
+    }], 'Убедитесь, что ?fields= оставляет в ответе только эти поля.'
+    select = [query['sql'] for query in queries if 'blog_post' in query['sql']]
+    assert '"text"' not in select[-1], (
+        'Убедитесь, что ?fields= выбирает из базы только нужные столбцы.'
+    )
+    error = get_json(client, '/api/posts/?fields=id,password', status=400)
+    assert 'password' in error['error']
+
+
+def test_post_filters(client, post_with_published_location,
+                      post_of_another_author):
+    post = post_with_published_location
+    data = get_json(client, f'/api/posts/?author={post.author.username}')
+    assert [row['id'] for row in data['results']] == [post.id]
+    data = get_json(client, '/api/posts/?category=missing')
+    assert data['results'] == []
+
+
+def test_hidden_post_not_found(client, future_posts):
+    get_json(client, f'/api/posts/{future_posts[0].id}/', status=404)
+    get_json(client, f'/api/posts/{future_posts[0].id}/comments/',
+             status=404)
+
+
+def test_comment_list(client, mixer, post_with_published_location):
+    post = post_with_published_location
+    comments = mixer.cycle(3).blend('blog.Comment', post=post)
+    data = get_json(
+        client, f'/api/posts/{post.id}/comments/?fields=id,author'
+    )
+    assert data['results'] == [
+        {'id': comment.id, 'author': comment.author.username}
+        for comment in sorted(
+            comments, key=lambda comment: (comment.created_at, comment.id)
+        )
+    ]
+
+
+def test_lookup_lists(client, published_category, published_locations,
+                      posts_with_unpublished_category):
+    data = get_json(client, '/api/categories/?fields=slug')
+    assert {'slug': published_category.slug} in data['results']
+    hidden = posts_with_unpublished_category[0].category.slug
+    assert {'slug': hidden} not in data['results'], (
+        'Убедитесь, что API не показывает снятые с публикации категории.'
+    )
+    data = get_json(client, '/api/locations/')
+    assert {row['id'] for row in data['results']} >= {
+        location.id for location in published_locations
+    }
+
+
+def test_lookup_lists_are_cached_and_revalidated(client, published_category):
+    url = '/api/categories/?fields=title'
+    response = client.get(url)
+    assert response.has_header('ETag'), (
+        'Убедитесь, что списки категорий и местоположений отдают ETag.'
+    )
+    assert client.get(
+        url, HTTP_IF_NONE_MATCH=response['ETag']
+    ).status_code == 304
+
+    published_category.title = 'Новое название'
+    published_category.save()
+    response = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+    assert response.status_code == 200
+    assert {'title': 'Новое название'} in json.loads(response.content)[
+        'results'
+    ], 'Убедитесь, что изменение категории сбрасывает кеш списка.'
+
+
+def test_fallback_serializer(monkeypatch, client,
+                             post_with_published_location):
+    post = post_with_published_location
+    monkeypatch.setattr(api, 'orjson', None)
+    data = get_json(client, f'/api/posts/{post.id}/?fields=id,pub_date')
+    assert data['id'] == post.id
+    assert data['pub_date'].startswith(
+        post.pub_date.strftime('%Y-%m-%dT%H:%M:%S')
+    ), 'Убедитесь, что без orjson API выводит даты в формате ISO 8601.'
+
+
+def test_api_is_read_only(client):
+    assert client.post('/api/posts/').status_code == 405
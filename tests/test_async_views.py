@@ -0,0 +1,114 @@
+import importlib
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient, override_settings
+from django.urls import clear_url_caches, resolve, reverse
+
+from blog import async_views
+
+pytestmark = [pytest.mark.django_db]
+
+ASYNC_ROUTES = ['index', 'post_detail', 'category_posts', 'profile']
+
+
+def reload_urls():
+    import blog.urls
+    import blogicum.urls
+
+    clear_url_caches()
+    importlib.reload(blog.urls)
+    importlib.reload(blogicum.urls)
+
+
+@pytest.fixture
+def async_routes():
+    with override_settings(BLOG_ASYNC_VIEWS=ASYNC_ROUTES,
+                           BLOG_PAGE_CACHE_TIMEOUT=0):
+        reload_urls()
+        yield
+    reload_urls()
+
+
+def get_async(url, user=None):
+    client = AsyncClient()
+    if user is not None:
+        client.force_login(user)
+    return async_to_sync(client.get)(url)
+
+
+def get_page_ids(response):
+    return [post.id for post in response.context['page_obj']]
+
+
+def test_routes_use_async_views(async_routes):
+    assert resolve('/').func is async_views.index, (
+        'Убедитесь, что маршруты из BLOG_ASYNC_VIEWS обслуживаются '
+        'асинхронными представлениями.'
+    )
+
+
+@pytest.mark.parametrize('as_author', [False, True])
+@override_settings(BLOG_PAGE_CACHE_TIMEOUT=0)
+def test_async_lists_match_sync(
+        client, user, published_category, many_posts_with_published_locations,
+        future_posts, as_author):
+    if as_author:
+        client.force_login(user)
+    urls = [
+        reverse('blog:index'),
+        reverse('blog:index') + '?page=2',
+        reverse('blog:category_posts', args=[published_category.slug]),
+        reverse('blog:profile', args=[user.username]),
+    ]
+    expected = {url: get_page_ids(client.get(url)) for url in urls}
+    with override_settings(BLOG_ASYNC_VIEWS=ASYNC_ROUTES):
+        reload_urls()
+        try:
+            actual = {
+                url: get_page_ids(get_async(url, user if as_author else None))
+                for url in urls
+            }
+        finally:
+            reload_urls()
+    assert actual == expected, (
+        'Убедитесь, что асинхронные страницы показывают те же публикации, '
+        'что и синхронные.'
+    )
+
+
+def test_async_post_detail(async_routes, post_with_published_location,
+                           comment_to_a_post):
+    post = post_with_published_location
+    url = reverse('blog:post_detail', args=[post.id])
+    response = get_async(url)
+    assert response.status_code == 200
+    assert response.context['post'] == post
+    assert 'form' in response.context
+    assert 'comments' in response.context
+
+
+def test_async_views_hide_unpublished(
+        async_routes, unpublished_posts_with_published_locations):
+    unpublished_post = unpublished_posts_with_published_locations[0]
+    url = reverse('blog:post_detail', args=[unpublished_post.id])
+    assert get_async(url).status_code == 404, (
+        'Убедитесь, что асинхронная страница публикации скрывает снятую '
+        'с публикации запись от посторонних.'
+    )
+    assert get_async(url, unpublished_post.author).status_code == 200
+    assert get_async(
+        reverse('blog:category_posts', args=['missing'])
+    ).status_code == 404
+
+
+def test_async_conditional_get(async_routes, post_with_published_location):
+    client = AsyncClient()
+    response = async_to_sync(client.get)(reverse('blog:index'))
+    assert response.has_header('ETag')
+    response = async_to_sync(client.get)(
+        reverse('blog:index'), headers={'If-None-Match': response['ETag']}
+    )
+    assert response.status_code == 304, (
+        'Убедитесь, что асинхронные страницы отвечают 304 на If-None-Match.'
+    )
@@ -0,0 +1,89 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Comment, Post
+from blog.service import get_base_request
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_count_follows_comments(
+        mixer, post_with_published_location, another_user
+):
+    post = post_with_published_location
+    comments = mixer.cycle(3).blend('blog.Comment', post=post)
+    post.refresh_from_db()
+    assert post.comment_count == 3, (
+        'Убедитесь, что счётчик комментариев увеличивается при добавлении'
+        ' комментария.'
+    )
+
+    comments[0].delete()
+    mixer.blend('blog.Comment', post=post, author=another_user)
+    another_user.delete()
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        'Убедитесь, что счётчик комментариев уменьшается при удалении'
+        ' комментария, в том числе каскадном.'
+    )
+
+
+def test_recount_comments_command(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(2).blend('blog.Comment', post=post)
+    Post.objects.filter(pk=post.pk).update(comment_count=10)
+
+    call_command('recount_comments')
+
+    post.refresh_from_db()
+    assert post.comment_count == Comment.objects.filter(post=post).count()
+
+
+@override_settings(BLOG_COMMENT_COUNTS='prefetch')
+def test_prefetched_comment_counts(
+        mixer, many_posts_with_published_locations):
+    posts = many_posts_with_published_locations
+    mixer.cycle(3).blend('blog.Comment', post=posts[0])
+    mixer.cycle(2).blend('blog.Comment', post=posts[1])
+    Post.objects.update(comment_count=100)
+
+    with CaptureQueriesContext(connection) as queries:
+        page = list(get_base_request())
+    assert len(queries) == 2, (
+        'Убедитесь, что комментарии к странице публикаций считаются одним '
+        'запросом.'
+    )
+    counts = {post.pk: post.comment_count for post in page}
+    assert counts == {
+        post.pk: {posts[0].pk: 3, posts[1].pk: 2}.get(post.pk, 0)
+        for post in posts
+    }, 'Убедитесь, что число комментариев считается по самим комментариям.'
+
+
+@override_settings(BLOG_COMMENT_COUNTS='prefetch')
+def test_prefetched_comment_counts_on_pages(
+        client, mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(2).blend('blog.Comment', post=post)
+    Post.objects.update(comment_count=0)
+    for url in ('/', f'/profile/{post.author.username}/',
+                f'/category/{post.category.slug}/'):
+        content = client.get(url).content.decode()
+        assert 'Комментарии (2)' in content, url
+
+
+@override_settings(BLOG_COMMENT_COUNTS='prefetch')
+def test_prefetched_comment_counts_follow_chunks(
+        many_posts_with_published_locations):
+    with CaptureQueriesContext(connection) as queries:
+        posts = list(
+            Post.objects.with_comment_counts().iterator(chunk_size=5)
+        )
+    counts = [query for query in queries if 'GROUP BY' in query['sql']]
+    assert len(counts) == len(posts) // 5, (
+        'Убедитесь, что при iterator() комментарии считаются по частям, '
+        'а не после чтения всех строк.'
+    )
@@ -0,0 +1,41 @@
+import pytest
+from bs4 import BeautifulSoup
+
+from blog.constant import COMMENTS_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_more_link(content):
+    return BeautifulSoup(content, features='html.parser').find(
+        'a', attrs={'data-more-comments': True}
+    )
+
+
+def test_comments_are_paginated(
+        mixer, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    comments = mixer.cycle(COMMENTS_PER_PAGE + 5).blend(
+        'blog.Comment', post=post
+    )
+
+    response = user_client.get(f'/posts/{post.id}/')
+    assert len(response.context['comments']) == COMMENTS_PER_PAGE, (
+        'Убедитесь, что на странице публикации выводится только первая'
+        ' страница комментариев.'
+    )
+    more_link = get_more_link(response.content.decode('utf-8'))
+    assert more_link, (
+        'Убедитесь, что под комментариями есть ссылка на следующую порцию.'
+    )
+
+    response = user_client.get(more_link['href'])
+    assert [comment.id for comment in response.context['comments']] == [
+        comment.id for comment in comments[COMMENTS_PER_PAGE:]
+    ]
+    assert get_more_link(response.content.decode('utf-8')) is None
+    assert '<html' not in response.content.decode('utf-8'), (
+        'Убедитесь, что следующая порция комментариев отдаётся фрагментом'
+        ' HTML без обвязки страницы.'
+    )
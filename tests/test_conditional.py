@@ -0,0 +1,75 @@
+from http import HTTPStatus
+from unittest import mock
+
+import pytest
+
+from blog.cache import ALL_PAGES_TAG, get_page_tag_versions
+from blog.models import Comment
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_unchanged_pages_answer_not_modified(
+        client, post_with_published_location, comment, settled_changes
+):
+    post = post_with_published_location
+    urls = (
+        '/',
+        f'/posts/{post.id}/',
+        f'/category/{post.category.slug}/',
+        f'/profile/{post.author.username}/',
+    )
+    for url in urls:
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.has_header('ETag') and response.has_header(
+            'Last-Modified'
+        ), f'Убедитесь, что страница `{url}` отдаёт ETag и Last-Modified.'
+
+        not_modified = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        assert not_modified.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Убедитесь, что неизменившаяся страница `{url}` отвечает 304.'
+        )
+        assert not not_modified.templates
+        assert client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        ).status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_changes_invalidate_validators(
+        client, user, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    comment = Comment.objects.create(post=post, author=user, text='Текст')
+    url = f'/posts/{post.id}/'
+    etag = client.get(url)['ETag']
+    assert user_client.get(url)['ETag'] != etag, (
+        'Убедитесь, что ETag зависит от того, кто смотрит страницу.'
+    )
+
+    comment.text = 'Изменённый комментарий'
+    comment.save()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        'Убедитесь, что изменение комментария меняет ETag страницы поста.'
+    )
+    assert 'Изменённый комментарий' in response.content.decode('utf-8')
+
+
+def test_last_modified_waits_for_its_second_to_end(
+        client, post_with_published_location, comment
+):
+    post_id = post_with_published_location.id
+    url = f'/posts/{post_id}/'
+    client.get(url)
+    comment.save()
+    versions = get_page_tag_versions([ALL_PAGES_TAG, f'post:{post_id}'])
+    changed_in = max(versions) // 1_000_000
+    with mock.patch('blog.conditional.time') as clock:
+        clock.time.return_value = changed_in + 0.999
+        assert not client.get(url).has_header('Last-Modified'), (
+            'Убедитесь, что страница, изменённая в текущую секунду, не '
+            'отдаёт Last-Modified: правка в ту же секунду его бы не изменила.'
+        )
+        clock.time.return_value = changed_in + 1
+        assert client.get(url).has_header('Last-Modified')
@@ -0,0 +1,33 @@
+import pytest
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.usefixtures('disable_page_cache'),
+]
+
+
+@pytest.fixture
+def commented_post(mixer, post_with_published_location):
+    mixer.cycle(5).blend('blog.Comment', post=post_with_published_location)
+    return post_with_published_location
+
+
+@pytest.mark.parametrize(
+    ('client_fixture', 'expected_queries'),
+    [
+        # Публикация и комментарии.
+        ('unlogged_client', 2),
+        # Сессия, пользователь, публикация и комментарии.
+        ('user_client', 4),
+        ('another_user_client', 4),
+    ],
+    ids=['anonymous', 'author', 'another user'],
+)
+def test_post_detail_query_count(
+        request, django_assert_num_queries, commented_post,
+        client_fixture, expected_queries
+):
+    client = request.getfixturevalue(client_fixture)
+    with django_assert_num_queries(expected_queries):
+        response = client.get(f'/posts/{commented_post.id}/')
+    assert response.status_code == 200
@@ -0,0 +1,116 @@
+from io import BytesIO, StringIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from PIL import Image
+
+from blog.cache import get_post_card, set_post_card
+from blog.forms import PostForm
+from blog.images import get_variant_name
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def make_upload(width, height):
+    buffer = BytesIO()
+    Image.new('RGB', (width, height), color=(73, 109, 137)).save(
+        buffer, format='JPEG'
+    )
+    return SimpleUploadedFile(
+        'photo.jpg', buffer.getvalue(), content_type='image/jpeg'
+    )
+
+
+def test_post_form_creates_image_variants(
+        user, published_category, published_location
+):
+    form = PostForm(
+        data={
+            'title': 'Фото',
+            'text': 'Текст',
+            'pub_date': '2020-01-01 10:00:00',
+            'category': published_category.id,
+            'location': published_location.id,
+        },
+        files={'image': make_upload(800, 400)},
+    )
+    assert form.is_valid(), form.errors
+    form.instance.author = user
+    post = form.save()
+    post.refresh_from_db()
+
+    storage = post.image.storage
+    for extension in ('webp', 'jpg'):
+        for width in (320, 640):
+            assert storage.exists(
+                get_variant_name(post.image.name, width, extension)
+            )
+        assert not storage.exists(
+            get_variant_name(post.image.name, 1280, extension)
+        ), 'Убедитесь, что изображения не увеличиваются.'
+    assert '640w' in post.image_srcsets['webp']
+
+
+def test_make_image_variants_backfills(post_with_published_location):
+    post = post_with_published_location
+    post.image.save('large.jpg', make_upload(700, 700))
+    storage = post.image.storage
+    variant = get_variant_name(post.image.name, 320, 'webp')
+    storage.delete(variant)
+    Post.objects.filter(pk=post.pk).update(image_variants={})
+    set_post_card(post.pk, 'карточка')
+
+    output = StringIO()
+    call_command('make_image_variants', stdout=output)
+    assert storage.exists(variant)
+    assert get_post_card(post.pk) is None, (
+        'Убедитесь, что команда сбрасывает кеш карточки публикации.'
+    )
+    assert 'Обработано изображений: 1' in output.getvalue()
+
+    output = StringIO()
+    call_command('make_image_variants', stdout=output)
+    assert 'Обработано изображений: 0' in output.getvalue(), (
+        'Убедитесь, что команда пропускает готовые копии изображений.'
+    )
+
+
+def get_variant_names(post):
+    post.refresh_from_db()
+    return [
+        get_variant_name(post.image_variants['name'], width, extension)
+        for width in post.image_variants['widths']
+        for extension in ('webp', 'jpg')
+    ]
+
+
+def test_replaced_image_variants_are_deleted(post_with_published_location):
+    post = post_with_published_location
+    post.image = make_upload(700, 700)
+    post.save()
+    old_names = get_variant_names(post)
+    storage = post.image.storage
+    assert old_names and all(storage.exists(name) for name in old_names)
+
+    post.image = make_upload(500, 500)
+    post.save()
+    assert not any(storage.exists(name) for name in old_names), (
+        'Убедитесь, что при замене изображения старые копии удаляются.'
+    )
+    assert all(storage.exists(name) for name in get_variant_names(post))
+
+
+def test_deleted_post_image_variants_are_deleted(
+        django_capture_on_commit_callbacks, post_with_published_location):
+    post = post_with_published_location
+    post.image = make_upload(700, 700)
+    post.save()
+    names = get_variant_names(post)
+    storage = post.image.storage
+    with django_capture_on_commit_callbacks(execute=True):
+        post.delete()
+    assert not any(storage.exists(name) for name in names), (
+        'Убедитесь, что копии изображения удаляются вместе с публикацией.'
+    )
@@ -0,0 +1,52 @@
+import pytest
+from django.db import connection
+
+from blog.models import Post
+from blog.service import get_base_request
+
+pytestmark = [pytest.mark.django_db]
+
+
+def explain(queryset):
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            # На пустых таблицах планировщик предпочитает полный просмотр.
+            cursor.execute('SET LOCAL enable_seqscan = off')
+    return queryset.explain()
+
+
+@pytest.mark.parametrize(
+    ('get_queryset', 'index_names'),
+    [
+        (
+            lambda user, category: get_base_request(),
+            # Лента фильтрует по списку опубликованных категорий, поэтому
+            # при одной категории подходит и индекс по категории.
+            ('post_feed_pub_date_idx', 'post_published_pub_date_idx',
+             'post_category_pub_date_idx'),
+        ),
+        (
+            lambda user, category: get_base_request().filter(
+                category=category),
+            ('post_category_pub_date_idx',),
+        ),
+        (
+            lambda user, category: get_base_request().filter(author=user),
+            ('post_author_pub_date_idx',),
+        ),
+        (
+            lambda user, category: Post.objects.filter(author=user),
+            ('post_author_pub_date_idx',),
+        ),
+    ],
+    ids=['feed', 'category', 'profile', 'own profile'],
+)
+def test_post_queries_use_indexes(
+        user, published_category, get_queryset, index_names
+):
+    if connection.vendor not in ('sqlite', 'postgresql'):
+        pytest.skip('План запроса проверяется для SQLite и PostgreSQL.')
+    plan = explain(get_queryset(user, published_category))
+    assert any(name in plan for name in index_names), (
+        f'Запрос к публикациям не использует индексы {index_names}:\n{plan}'
+    )
@@ -0,0 +1,139 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import transaction
+from django.test import override_settings
+from django.utils import timezone
+
+from blog.cache import (get_page_tag_versions, get_post_card_key,
+                        set_post_card)
+from blog.models import Post
+from blog.search import search_posts
+from blog.service import get_base_request
+from core.jobs import claim_job, enqueue, register, run_job
+from core.models import Job
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.usefixtures('queue_jobs'),
+]
+
+calls = []
+
+
+@register('tests.record')
+def record(value):
+    calls.append(value)
+
+
+@register('tests.fail')
+def fail():
+    raise RuntimeError('сбой')
+
+
+@pytest.fixture
+def queue_jobs():
+    calls.clear()
+    with override_settings(JOBS_ALWAYS_EAGER=False):
+        yield
+
+
+def test_enqueue_deduplicates_pending_jobs():
+    enqueue('tests.record', value=1)
+    enqueue('tests.record', value=1)
+    enqueue('tests.record', value=2)
+    assert Job.objects.count() == 2
+    call_command('run_jobs', '--once')
+    assert sorted(calls) == [1, 2]
+    assert not Job.objects.exists(), (
+        'Убедитесь, что выполненные задачи удаляются из очереди.'
+    )
+
+
+def test_claimed_job_is_locked():
+    enqueue('tests.record', value=1)
+    job = claim_job()
+    assert job.status == Job.RUNNING and job.attempts == 1
+    assert claim_job() is None, (
+        'Убедитесь, что задачу, взятую одним обработчиком, не берёт другой.'
+    )
+
+    Job.objects.filter(pk=job.pk).update(
+        locked_until=timezone.now() - timedelta(seconds=1)
+    )
+    retried = claim_job()
+    assert retried.pk == job.pk and retried.attempts == 2, (
+        'Убедитесь, что задача снова доступна после истечения блокировки.'
+    )
+    assert run_job(retried)
+    assert calls == [1] and not Job.objects.exists()
+
+
+@override_settings(JOBS_MAX_ATTEMPTS=2)
+def test_failed_job_is_retried_with_backoff():
+    enqueue('tests.fail')
+    assert run_job(claim_job()) is False
+    job = Job.objects.get()
+    assert job.status == Job.PENDING and 'сбой' in job.last_error
+    assert job.run_after > timezone.now()
+    assert claim_job() is None
+
+    Job.objects.update(run_after=timezone.now())
+    assert run_job(claim_job()) is False
+    assert Job.objects.get().status == Job.FAILED
+
+
+def test_post_save_work_runs_in_worker(post_with_published_location):
+    post = post_with_published_location
+    post.title = 'Уникальнозаголовочное'
+    post.save()
+    assert not search_posts(get_base_request(), post.title).exists()
+
+    call_command('run_jobs', '--once')
+    assert list(search_posts(get_base_request(), post.title)) == [post], (
+        'Убедитесь, что индексация публикации выполняется фоновой задачей.'
+    )
+
+
+def test_job_purges_reach_shared_cache(settings, post_with_published_location):
+    post = post_with_published_location
+    shared = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+              'LOCATION': 'shared'}
+    with override_settings(
+        CACHES={**settings.CACHES, 'shared': shared},
+        BLOG_SHARED_CACHE='shared',
+    ):
+        set_post_card(post.pk, 'карточка')
+        [version] = get_page_tag_versions([f'post:{post.pk}'])
+        Post.objects.filter(pk=post.pk).update(comment_count=5)
+        enqueue('blog.recount_comments', post_id=post.pk)
+
+        call_command('run_jobs', '--once')
+        assert caches['shared'].get(get_post_card_key(post.pk)) is None, (
+            'Убедитесь, что фоновая задача сбрасывает карточку публикации '
+            'в общем для всех процессов кэше.'
+        )
+        assert get_page_tag_versions([f'post:{post.pk}']) != [version]
+
+
+
+def test_eager_jobs_wait_for_commit_and_log_errors(
+        django_capture_on_commit_callbacks, caplog):
+    with override_settings(JOBS_ALWAYS_EAGER=True), \
+            django_capture_on_commit_callbacks() as callbacks, \
+            transaction.atomic():
+        enqueue('tests.record', value=1)
+        enqueue('tests.fail')
+        assert calls == [], (
+            'Убедитесь, что задачи в режиме JOBS_ALWAYS_EAGER выполняются '
+            'после фиксации транзакции.'
+        )
+    for callback in callbacks:
+        callback()
+    assert calls == [1]
+    assert 'tests.fail' in caplog.text, (
+        'Убедитесь, что ошибка задачи записывается в журнал, а не '
+        'прерывает сохранение.'
+    )
@@ -0,0 +1,69 @@
+from unittest import mock
+
+import pytest
+from django.db import transaction
+from django.test import override_settings
+
+from blog.checks import check_shared_cache
+from blog.lookups import categories
+from blog.service import get_base_request
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_feed_reads_categories_without_joins(
+        django_assert_num_queries, post_with_published_location
+):
+    get_base_request()
+    with django_assert_num_queries(1) as captured:
+        post = list(get_base_request())[0]
+        assert post.category.title and post.location.name
+    sql = captured.captured_queries[0]['sql']
+    assert 'blog_category' not in sql and 'blog_location' not in sql, (
+        'Убедитесь, что лента берёт категории и местоположения из таблицы'
+        ' в памяти, а не из JOIN.'
+    )
+
+
+def test_category_changes_refresh_lookup(
+        django_assert_num_queries, published_category
+):
+    assert categories.get_by('slug', published_category.slug).is_published
+    published_category.is_published = False
+    published_category.save()
+    with django_assert_num_queries(0):
+        category = categories.get_by('slug', published_category.slug)
+    assert not category.is_published, (
+        'Убедитесь, что сохранение категории обновляет таблицу в памяти.'
+    )
+    assert published_category.pk not in categories.published_ids()
+
+
+def test_rolled_back_changes_stay_out_of_lookup(published_category):
+    assert categories.get_by('slug', published_category.slug).is_published
+    with pytest.raises(RuntimeError), transaction.atomic():
+        published_category.is_published = False
+        published_category.save()
+        raise RuntimeError
+    assert categories.get_by('slug', published_category.slug).is_published, (
+        'Убедитесь, что таблица в памяти обновляется только после фиксации '
+        'транзакции.'
+    )
+
+
+def test_lookup_version_expires(settings):
+    cache = categories.cache
+    with mock.patch.object(cache, 'set', wraps=cache.set) as cache_set:
+        categories.forget()
+    cache_set.assert_any_call(
+        categories.version_key, mock.ANY, settings.BLOG_LOOKUP_CACHE_TIMEOUT
+    )
+
+
+def test_shared_cache_must_span_processes():
+    assert [error.id for error in check_shared_cache(None)] == ['blog.E001']
+    redis = {'BACKEND': 'django.core.cache.backends.redis.RedisCache'}
+    with override_settings(CACHES={'default': redis}):
+        assert check_shared_cache(None) == [], (
+            'Убедитесь, что общий кеш не может быть локальным для процесса.'
+        )
@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+from blog.materialized import author_feed, category_feed
+from blog.models import FeedEntry, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_page_ids(client, url):
+    ids = []
+    while url:
+        page_obj = client.get(url).context['page_obj']
+        ids.extend(post.id for post in page_obj)
+        url = (
+            url.split('?')[0] + f'?page={page_obj.next_page_number()}'
+            if page_obj.has_next() else None
+        )
+    return ids
+
+
+@override_settings(BLOG_PAGE_CACHE_TIMEOUT=0)
+def test_materialized_pages_match_live_queries(
+        client, user, published_category,
+        many_posts_with_published_locations, future_posts,
+        posts_with_unpublished_category,
+        unpublished_posts_with_published_locations,
+):
+    urls = (
+        f'/category/{published_category.slug}/',
+        f'/profile/{user.username}/',
+    )
+    expected = {url: get_page_ids(client, url) for url in urls}
+    with override_settings(BLOG_MATERIALIZED_FEEDS=True):
+        for url in urls:
+            assert get_page_ids(client, url) == expected[url], (
+                f'Убедитесь, что страница `{url}` из предрассчитанной ленты'
+                ' совпадает с обычным запросом.'
+            )
+
+
+def test_entries_follow_post_changes(post_with_published_location):
+    post = post_with_published_location
+    feeds = {author_feed(post.author_id), category_feed(post.category_id)}
+    assert set(FeedEntry.objects.filter(post=post).values_list(
+        'feed', flat=True)) == feeds
+
+    post.is_published = False
+    post.save()
+    assert not FeedEntry.objects.filter(post=post).exists()
+
+    post.is_published = True
+    post.pub_date = timezone.now() + timedelta(days=1)
+    post.save()
+    feed = category_feed(post.category_id)
+    assert not FeedEntry.objects.visible(feed).exists()
+    assert FeedEntry.objects.visible(
+        feed, now=post.pub_date
+    ).get().post_id == post.id, (
+        'Убедитесь, что отложенная публикация появляется в ленте, когда'
+        ' наступает её время.'
+    )
+
+
+def test_rebuild_feeds(post_with_published_location):
+    FeedEntry.objects.all().delete()
+    Post.objects.update(title='Без сигналов')
+    call_command('rebuild_feeds')
+    assert FeedEntry.objects.count() == 2
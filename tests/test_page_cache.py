@@ -0,0 +1,62 @@
+import pytest
+from django.db import transaction
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_content(client, url):
+    return client.get(url).content.decode('utf-8')
+
+
+def test_anonymous_pages_are_cached_and_purged_by_tags(
+        client, user_client, post_with_published_location,
+        post_with_another_category
+):
+    post = post_with_published_location
+    other_post = post_with_another_category
+    category_url = f'/category/{post.category.slug}/'
+    other_category_url = f'/category/{other_post.category.slug}/'
+    for url in ('/', category_url, other_category_url):
+        get_content(client, url)
+
+    Post.objects.filter(pk=other_post.pk).update(title='Тихая правка')
+    assert 'Тихая правка' not in get_content(client, other_category_url), (
+        'Убедитесь, что страницы для анонимных посетителей берутся из кеша.'
+    )
+    assert user_client.get(other_category_url).context is not None, (
+        'Убедитесь, что авторизованные пользователи не получают страницы'
+        ' из кеша.'
+    )
+
+    post.title = 'Новый заголовок'
+    post.save()
+    assert 'Новый заголовок' in get_content(client, '/')
+    assert 'Новый заголовок' in get_content(client, category_url)
+    assert 'Тихая правка' not in get_content(client, other_category_url), (
+        'Убедитесь, что сохранение публикации сбрасывает только страницы,'
+        ' на которых она выводится.'
+    )
+
+
+def test_page_tags_are_touched_after_commit(
+        client, django_capture_on_commit_callbacks,
+        post_with_published_location
+):
+    post = post_with_published_location
+    url = f'/posts/{post.id}/'
+    get_content(client, url)
+    with django_capture_on_commit_callbacks() as callbacks, \
+            transaction.atomic():
+        post.title = 'Новый заголовок'
+        post.save()
+        # A concurrent reader still sees the old row until the commit.
+        Post.objects.filter(pk=post.pk).update(title=post.title + '!')
+        assert 'Новый заголовок' not in get_content(client, url), (
+            'Убедитесь, что страницы сбрасываются после фиксации '
+            'транзакции: иначе читатель закеширует старую строку заново.'
+        )
+    for callback in callbacks:
+        callback()
+    assert 'Новый заголовок!' in get_content(client, url)
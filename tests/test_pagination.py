@@ -0,0 +1,107 @@
+import pytest
+from django.core.paginator import Paginator
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Post
+from blog.paginator import CachedCountPaginator
+from blog.templatetags.blog_tags import page_range
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@override_settings(BLOG_FEED_PAGINATION='cursor')
+def test_index_cursor_pagination(
+        user_client, many_posts_with_published_locations
+):
+    posts = many_posts_with_published_locations
+    expected_ids = [
+        post.id for post in sorted(
+            posts, key=lambda post: (post.pub_date, post.id), reverse=True
+        )
+    ]
+
+    seen_ids, cursors, url = [], [], '/'
+    while url:
+        response = user_client.get(url)
+        page_obj = response.context['page_obj']
+        assert len(page_obj) <= N_PER_PAGE
+        seen_ids.extend(post.id for post in page_obj)
+        cursors.append(page_obj.previous_cursor)
+        url = (
+            f'/?cursor={page_obj.next_cursor}'
+            if page_obj.has_next() else None
+        )
+    assert seen_ids == expected_ids, (
+        'Убедитесь, что при курсорной пагинации главная страница выводит'
+        ' все публикации по одному разу, «от новых к старым».'
+    )
+
+    response = user_client.get(f'/?cursor={cursors[-1]}')
+    assert [post.id for post in response.context['page_obj']] == (
+        expected_ids[:N_PER_PAGE]
+    ), 'Убедитесь, что ссылка на предыдущую страницу ведёт назад по ленте.'
+    assert not response.context['page_obj'].has_previous()
+
+
+@override_settings(BLOG_FEED_PAGINATION='cursor')
+def test_index_cursor_pagination_ignores_broken_cursor(
+        user_client, many_posts_with_published_locations
+):
+    response = user_client.get('/?cursor=not-a-cursor')
+    assert response.status_code == 200
+    assert len(response.context['page_obj']) == N_PER_PAGE
+
+
+def count_queries(queries):
+    return [query for query in queries if 'COUNT(' in query['sql']]
+
+
+def test_feed_count_is_cached(
+        user_client, mixer, user, published_category,
+        many_posts_with_published_locations):
+    url = f'/category/{published_category.slug}/'
+    user_client.get(url)
+    with CaptureQueriesContext(connection) as queries:
+        paginator = user_client.get(url).context['page_obj'].paginator
+    assert not count_queries(queries), (
+        'Убедитесь, что число публикаций в ленте берётся из кеша.'
+    )
+    assert paginator.count == len(many_posts_with_published_locations)
+
+    mixer.blend('blog.Post', author=user, category=published_category)
+    paginator = user_client.get(url).context['page_obj'].paginator
+    assert paginator.count == len(many_posts_with_published_locations) + 1, (
+        'Убедитесь, что кешированное число публикаций сбрасывается при '
+        'добавлении публикации.'
+    )
+
+
+def test_page_range_is_elided():
+    page = Paginator(range(10000), N_PER_PAGE).page(500)
+    numbers = list(page_range(page))
+    assert numbers == [
+        1, Paginator.ELLIPSIS, 498, 499, 500, 501, 502, Paginator.ELLIPSIS,
+        10000 // N_PER_PAGE,
+    ], 'Убедитесь, что пагинатор выводит только соседние страницы.'
+
+
+def test_estimated_page_range_stops_at_window():
+    page = Paginator(range(10000), N_PER_PAGE).page(500)
+    page.paginator.approximate = True
+    assert list(page_range(page)) == [
+        1, Paginator.ELLIPSIS, 498, 499, 500, 501, 502, Paginator.ELLIPSIS,
+    ], (
+        'Убедитесь, что при приблизительном подсчёте пагинатор не ссылается '
+        'на последнюю страницу: её может не быть.'
+    )
+
+
+def test_count_estimate_is_postgresql_only(
+        many_posts_with_published_locations):
+    paginator = CachedCountPaginator(Post.objects.all(), N_PER_PAGE)
+    assert paginator.estimate_count() is None
+    assert paginator.count == len(many_posts_with_published_locations)
+    assert not paginator.approximate
@@ -0,0 +1,189 @@
+import os
+import time
+from typing import NamedTuple
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, get_resolver, reverse
+
+from blog.models import Comment, Post
+from blog.service import recount_comments
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.usefixtures('disable_page_cache'),
+]
+
+# Крупные наборы данных включаются переменной окружения, например
+# PERF_MAX_POSTS=100000 pytest tests/test_performance.py
+PERF_MAX_POSTS = int(os.getenv('PERF_MAX_POSTS', 1000))
+# Бюджеты времени проверяются только по запросу: PERF_CHECK_TIME=1.
+# Бюджеты числа SQL-запросов проверяются всегда.
+PERF_CHECK_TIME = os.getenv('PERF_CHECK_TIME', '') == '1'
+# Множитель бюджетов времени для медленных машин.
+PERF_TIME_SCALE = float(os.getenv('PERF_TIME_SCALE', 1))
+DATASET_SIZES = (1000, 10000, 100000)
+BATCH_SIZE = 1000
+
+
+class Budget(NamedTuple):
+    queries: int
+    db_ms: float
+    render_ms: float
+
+
+# Запросы сессии и пользователя входят в бюджет авторизованных страниц.
+# Бюджеты лент считают холодный кеш: счётчик страниц посчитан заново.
+BUDGETS = {
+    'blog:index': Budget(queries=6, db_ms=150, render_ms=400),
+    'blog:post_detail': Budget(queries=4, db_ms=50, render_ms=300),
+    'blog:create_post': Budget(queries=4, db_ms=50, render_ms=300),
+    'blog:edit_post': Budget(queries=6, db_ms=50, render_ms=300),
+    'blog:delete_post': Budget(queries=5, db_ms=50, render_ms=300),
+    'blog:category_posts': Budget(queries=6, db_ms=150, render_ms=400),
+    'blog:search': Budget(queries=2, db_ms=50, render_ms=300),
+    'blog:profile': Budget(queries=5, db_ms=150, render_ms=400),
+    'blog:edit_profile': Budget(queries=2, db_ms=50, render_ms=300),
+    'blog:comments': Budget(queries=4, db_ms=50, render_ms=200),
+    'blog:add_comment': Budget(queries=2, db_ms=50, render_ms=300),
+    'blog:edit_comment': Budget(queries=4, db_ms=50, render_ms=300),
+    'blog:delete_comment': Budget(queries=4, db_ms=50, render_ms=300),
+    'blog:rss': Budget(queries=4, db_ms=150, render_ms=300),
+    'blog:atom': Budget(queries=4, db_ms=150, render_ms=300),
+    'blog:category_rss': Budget(queries=4, db_ms=150, render_ms=300),
+    'blog:category_atom': Budget(queries=4, db_ms=150, render_ms=300),
+    'blog:profile_rss': Budget(queries=5, db_ms=150, render_ms=300),
+    'blog:profile_atom': Budget(queries=5, db_ms=150, render_ms=300),
+    'blog:api_posts': Budget(queries=4, db_ms=150, render_ms=200),
+    'blog:api_post': Budget(queries=3, db_ms=50, render_ms=200),
+    'blog:api_comments': Budget(queries=4, db_ms=50, render_ms=200),
+    'blog:api_categories': Budget(queries=2, db_ms=50, render_ms=200),
+    'blog:api_locations': Budget(queries=2, db_ms=50, render_ms=200),
+    'pages:about': Budget(queries=2, db_ms=50, render_ms=200),
+    'pages:rules': Budget(queries=2, db_ms=50, render_ms=200),
+    'registration': Budget(queries=2, db_ms=50, render_ms=200),
+}
+# Routes of other applications, which this project does not budget.
+FOREIGN_NAMESPACES = {'admin'}
+FOREIGN_ROUTES = {
+    'login', 'logout', 'password_change', 'password_change_done',
+    'password_reset', 'password_reset_done', 'password_reset_confirm',
+    'password_reset_complete',
+}
+
+
+@pytest.fixture(
+    params=[
+        pytest.param(
+            size,
+            marks=pytest.mark.skipif(
+                size > PERF_MAX_POSTS,
+                reason=f'PERF_MAX_POSTS={PERF_MAX_POSTS}',
+            ),
+        )
+        for size in DATASET_SIZES
+    ],
+    ids=lambda size: f'{size} posts',
+)
+def dataset(request, mixer, user, published_category, published_location):
+    size = request.param
+    with mixer.ctx(commit=False):
+        posts = mixer.cycle(size).blend(
+            'blog.Post',
+            author=user,
+            category=published_category,
+            location=published_location,
+            is_published=True,
+            image='',
+        )
+    Post.objects.bulk_create(posts, batch_size=BATCH_SIZE)
+    post = Post.objects.latest('pub_date')
+    with mixer.ctx(commit=False):
+        comments = mixer.cycle(size // 10).blend(
+            'blog.Comment', author=user, post=mixer.sequence(
+                *Post.objects.order_by('-pub_date')[:100]
+            )
+        )
+    Comment.objects.bulk_create(comments, batch_size=BATCH_SIZE)
+    recount_comments()
+    return {
+        'post_id': post.id,
+        'comment_id': Comment.objects.filter(post=post).first().id,
+        'category_slug': published_category.slug,
+        'username': user.username,
+    }
+
+
+def get_url_kwargs(name, dataset):
+    kwargs = {
+        'blog:post_detail': ('post_id',),
+        'blog:api_post': ('post_id',),
+        'blog:api_comments': ('post_id',),
+        'blog:category_rss': ('category_slug',),
+        'blog:category_atom': ('category_slug',),
+        'blog:profile_rss': ('username',),
+        'blog:profile_atom': ('username',),
+        'blog:edit_post': ('post_id',),
+        'blog:delete_post': ('post_id',),
+        'blog:category_posts': ('category_slug',),
+        'blog:profile': ('username',),
+        'blog:comments': ('post_id',),
+        'blog:add_comment': ('post_id',),
+        'blog:edit_comment': ('post_id', 'comment_id'),
+        'blog:delete_comment': ('post_id', 'comment_id'),
+    }.get(name, ())
+    return {key: dataset[key] for key in kwargs}
+
+
+def get_route_names(patterns=None, prefix=''):
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.namespace not in FOREIGN_NAMESPACES:
+                namespace = pattern.namespace
+                yield from get_route_names(
+                    pattern.url_patterns,
+                    f'{prefix}{namespace}:' if namespace else prefix,
+                )
+        elif pattern.name and pattern.name not in FOREIGN_ROUTES:
+            yield f'{prefix}{pattern.name}'
+
+
+def test_every_route_has_budget():
+    missing = sorted(set(get_route_names()) - set(BUDGETS))
+    assert not missing, (
+        f'Добавьте в BUDGETS бюджеты маршрутов: {", ".join(missing)}.'
+    )
+
+
+@pytest.mark.parametrize('url_name', BUDGETS)
+def test_route_budget(user_client, dataset, url_name, record_property):
+    budget = BUDGETS[url_name]
+    url = reverse(url_name, kwargs=get_url_kwargs(url_name, dataset))
+
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        response = user_client.get(url)
+        total_ms = (time.perf_counter() - started) * 1000
+    db_ms = sum(float(query['time']) for query in queries) * 1000
+    render_ms = total_ms - db_ms
+    record_property('queries', len(queries))
+    record_property('db_ms', round(db_ms, 1))
+    record_property('render_ms', round(render_ms, 1))
+
+    assert response.status_code == 200, f'{url} вернул {response.status_code}'
+    assert len(queries) <= budget.queries, (
+        f'{url}: {len(queries)} SQL-запросов при бюджете {budget.queries}:\n'
+        + '\n'.join(query['sql'] for query in queries)
+    )
+    if not PERF_CHECK_TIME:
+        return
+    assert db_ms <= budget.db_ms * PERF_TIME_SCALE, (
+        f'{url}: {db_ms:.1f} мс в базе данных при бюджете {budget.db_ms} мс'
+    )
+    assert render_ms <= budget.render_ms * PERF_TIME_SCALE, (
+        f'{url}: {render_ms:.1f} мс на отрисовку при бюджете'
+        f' {budget.render_ms} мс'
+    )
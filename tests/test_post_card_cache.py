@@ -0,0 +1,78 @@
+from unittest import mock
+
+import pytest
+from django.core.cache import caches
+from django.db import transaction
+
+from blog.cache import (POST_CARD_GENERATION_KEY, get_post_card,
+                        set_post_card)
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_post_card_is_cached_and_invalidated(
+        mixer, client, post_with_published_location
+):
+    post = post_with_published_location
+    client.get('/')
+    assert post.title in get_post_card(post.pk), (
+        'Убедитесь, что карточка публикации сохраняется в кеш.'
+    )
+
+    post.title = 'Новый заголовок'
+    post.save()
+    assert get_post_card(post.pk) is None
+    assert 'Новый заголовок' in client.get('/').content.decode()
+
+    mixer.blend('blog.Comment', post=post)
+    assert 'Комментарии (1)' in client.get('/').content.decode(), (
+        'Убедитесь, что кеш карточки сбрасывается при добавлении комментария.'
+    )
+
+    post.category.title = 'Новая категория'
+    post.category.save()
+    assert 'Новая категория' in client.get('/').content.decode(), (
+        'Убедитесь, что кеш карточек сбрасывается при изменении категории.'
+    )
+
+
+def test_post_cards_are_read_once_per_page(
+        user_client, many_posts_with_published_locations):
+    user_client.get('/')
+    backend = caches['default']
+    with mock.patch.object(backend, 'get_or_set',
+                           wraps=backend.get_or_set) as get_or_set, \
+            mock.patch.object(backend, 'get_many',
+                              wraps=backend.get_many) as get_many, \
+            mock.patch('blog.templatetags.blog_tags.get_post_card') as single:
+        user_client.get('/')
+    generation_reads = [
+        call for call in get_or_set.call_args_list
+        if call.args[0] == POST_CARD_GENERATION_KEY
+    ]
+    assert not single.called and len(generation_reads) == 1, (
+        'Убедитесь, что карточки страницы читаются из кеша одним запросом.'
+    )
+    card_reads = [
+        call for call in get_many.call_args_list
+        if all(key.startswith('post_card:') for key in call.args[0])
+    ]
+    assert len(card_reads) == 1
+
+
+def test_post_card_is_forgotten_after_commit(
+        django_capture_on_commit_callbacks, post_with_published_location
+):
+    post = post_with_published_location
+    set_post_card(post.pk, 'карточка')
+    with django_capture_on_commit_callbacks() as callbacks, \
+            transaction.atomic():
+        post.title = 'Новый заголовок'
+        post.save()
+        assert get_post_card(post.pk) == 'карточка', (
+            'Убедитесь, что карточка сбрасывается после фиксации '
+            'транзакции: иначе читатель закеширует старую строку заново.'
+        )
+    for callback in callbacks:
+        callback()
+    assert get_post_card(post.pk) is None
@@ -0,0 +1,53 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Comment
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_profile_stats_depend_on_viewer(
+        client, user_client, user, post_with_published_location,
+        unpublished_posts_with_published_locations
+):
+    url = f'/profile/{user.username}/'
+    public_profile = client.get(url).context['profile']
+    own_profile = user_client.get(url).context['profile']
+    assert public_profile.post_count == 1, (
+        'Убедитесь, что посетители видят в профиле число только'
+        ' опубликованных постов автора.'
+    )
+    assert own_profile.post_count == 4
+    assert own_profile.comment_count == 0
+
+
+def test_profile_user_is_fetched_once(user_client, user):
+    with CaptureQueriesContext(connection) as queries:
+        user_client.get(f'/profile/{user.username}/')
+    profile_queries = [
+        query for query in queries
+        if f"\"username\" = '{user.username}'" in query['sql']
+        and query['sql'].startswith('SELECT "auth_user"')
+    ]
+    assert len(profile_queries) == 1, (
+        'Убедитесь, что автор профиля загружается одним запросом.'
+    )
+
+
+def test_commenter_profile_follows_comments(
+        client, django_capture_on_commit_callbacks, another_user,
+        post_with_published_location
+):
+    url = f'/profile/{another_user.username}/'
+    assert client.get(url).context['profile'].comment_count == 0
+    comment = Comment.objects.create(
+        post=post_with_published_location, author=another_user, text='Текст'
+    )
+    assert 'Комментариев: 1' in client.get(url).content.decode(), (
+        'Убедитесь, что число комментариев в профиле комментатора '
+        'обновляется, когда он комментирует чужой пост.'
+    )
+    with django_capture_on_commit_callbacks(execute=True):
+        comment.delete()
+    assert 'Комментариев: 0' in client.get(url).content.decode()
@@ -0,0 +1,34 @@
+from datetime import timedelta
+
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+
+from blog.models import published_now
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_index_shows_post_once_its_pub_date_passes(
+        monkeypatch, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    post.pub_date = timezone.now() + timedelta(hours=1)
+    post.save()
+    assert post not in user_client.get('/').context['page_obj']
+
+    later = timezone.now() + timedelta(hours=2)
+    monkeypatch.setattr(timezone, 'now', lambda: later)
+    assert post in user_client.get('/').context['page_obj'], (
+        'Убедитесь, что отложенная публикация появляется на главной странице'
+        ' после наступления даты публикации.'
+    )
+
+
+@override_settings(BLOG_PUBLISHED_NOW_GRANULARITY=60)
+def test_published_now_is_bucketed(monkeypatch):
+    start = timezone.now().replace(second=0, microsecond=0)
+    for offset in (0, 15, 59):
+        moment = start + timedelta(seconds=offset)
+        monkeypatch.setattr(timezone, 'now', lambda: moment)
+        assert published_now() == start
@@ -0,0 +1,98 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.core.paginator import Paginator
+from django.db import connections
+from django.test import RequestFactory
+
+from blog.lookups import categories
+from blog.models import Post
+from blog.streaming import render_streaming
+from core.db_routers import (REPLICA_ALIAS, ReplicaRouter, pin_to_primary,
+                             read_from_replica)
+from core.middleware import PRIMARY_COOKIE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def replica(tmp_path):
+    """A second SQLite file with the schema but none of the test data."""
+    connections.settings[REPLICA_ALIAS] = {
+        **connections['default'].settings_dict,
+        'NAME': str(tmp_path / 'replica.sqlite3'),
+    }
+    call_command('migrate', database=REPLICA_ALIAS, verbosity=0)
+    yield REPLICA_ALIAS
+    connections[REPLICA_ALIAS].close()
+    del connections[REPLICA_ALIAS]
+    del connections.settings[REPLICA_ALIAS]
+
+
+def test_router_without_replica():
+    router = ReplicaRouter()
+    with read_from_replica():
+        assert router.db_for_read(Post) is None, (
+            'Убедитесь, что без реплики чтение идёт из основной базы.'
+        )
+
+
+def test_router_reads_from_replica(replica):
+    router = ReplicaRouter()
+    assert router.db_for_read(Post) is None
+    assert router.db_for_write(Post) is None
+    with read_from_replica():
+        assert router.db_for_read(Post) == replica
+        assert router.db_for_write(Post) is None
+        with pin_to_primary():
+            assert router.db_for_read(Post) is None
+
+
+def test_author_sees_own_writes_after_post(
+        replica, client, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    assert post.title not in client.get('/').content.decode('utf-8'), (
+        'Убедитесь, что лента читается из реплики.'
+    )
+
+    response = user_client.post(
+        f'/posts/{post.id}/comment/', data={'text': 'Комментарий'}
+    )
+    assert PRIMARY_COOKIE in response.cookies, (
+        'Убедитесь, что после записи клиент получает cookie, закрепляющую'
+        ' его чтение за основной базой.'
+    )
+    assert post.title in user_client.get('/').content.decode('utf-8'), (
+        'Убедитесь, что после записи автор читает из основной базы.'
+    )
+
+
+def test_streamed_posts_read_from_replica(
+        replica, user, post_with_published_location):
+    page_obj = Paginator(Post.objects.all(), 10).page(1)
+    page_obj.object_list = Post.objects.with_lookups()
+    request = RequestFactory().get('/')
+    request.user = user
+    with read_from_replica():
+        response = render_streaming(
+            request, 'blog/index.html', {'page_obj': page_obj}
+        )
+    content = b''.join(response.streaming_content).decode()
+    assert post_with_published_location.title not in content, (
+        'Убедитесь, что публикации потоковой страницы читаются из реплики, '
+        'как и остальная страница.'
+    )
+
+
+def test_lookup_tables_load_from_primary(replica, published_category):
+    with read_from_replica():
+        categories.forget()
+        assert categories.get(published_category.pk), (
+            'Убедитесь, что таблица категорий загружается из основной базы: '
+            'отставшая реплика закешировала бы старые строки.'
+        )
+        categories.cache.clear()
+        categories._snapshot = None
+        async_to_sync(categories.aprefetch)()
+        assert categories.get(published_category.pk)
@@ -0,0 +1,48 @@
+import pytest
+
+from blog.models import Post
+from blog.search import search_posts
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def cat_posts(mixer, user, published_category, published_location):
+    return [
+        mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            location=published_location, title=title, text=text,
+        )
+        for title, text in (
+            ('Кошки на крыше', 'Коты гуляют по крышам весной.'),
+            ('Про собак', 'Собака лает, а кошка спит.'),
+            ('Погода', 'Сегодня солнечно.'),
+        )
+    ]
+
+
+def test_search_page_finds_stemmed_words(client, cat_posts):
+    response = client.get('/search/', {'q': 'кошка'})
+    found = list(response.context['page_obj'])
+    assert found == cat_posts[:2], (
+        'Убедитесь, что поиск находит публикации по словоформам и выше'
+        ' ставит совпадения в заголовке.'
+    )
+
+
+def test_search_hides_unpublished_posts(client, cat_posts):
+    cat_posts[0].is_published = False
+    cat_posts[0].save()
+    response = client.get('/search/', {'q': 'кошки'})
+    assert list(response.context['page_obj']) == [cat_posts[1]]
+
+
+def test_search_index_follows_changes(cat_posts):
+    post = cat_posts[2]
+    post.text = 'Сегодня идёт дождь.'
+    post.save()
+    assert list(search_posts(Post.objects.all(), 'дожди')) == [post]
+    assert not search_posts(Post.objects.all(), 'солнечно').exists()
+
+    post.delete()
+    assert not search_posts(Post.objects.all(), 'дождь').exists()
@@ -0,0 +1,42 @@
+import pytest
+from django.db import connections
+from django.test import override_settings
+
+pytestmark = [pytest.mark.django_db]
+
+PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 1024 * 1024,
+    'cache_size': -1000,
+    'busy_timeout': 1234,
+}
+
+
+@pytest.fixture
+def sqlite_file_connection(tmp_path):
+    connection_settings = {
+        **connections['default'].settings_dict,
+        'NAME': str(tmp_path / 'pragmas.sqlite3'),
+    }
+    if connection_settings['ENGINE'] != 'django.db.backends.sqlite3':
+        pytest.skip('Проверка только для SQLite.')
+    connection = connections['default'].__class__(connection_settings)
+    yield connection
+    connection.close()
+
+
+@override_settings(SQLITE_PRAGMAS=PRAGMAS)
+def test_new_connections_get_pragmas(sqlite_file_connection):
+    with sqlite_file_connection.cursor() as cursor:
+        values = {}
+        for name in PRAGMAS:
+            cursor.execute(f'PRAGMA {name}')
+            values[name] = cursor.fetchone()[0]
+    assert values == {
+        'journal_mode': 'wal',
+        'synchronous': 1,
+        'mmap_size': 1024 * 1024,
+        'cache_size': -1000,
+        'busy_timeout': 1234,
+    }, 'Убедитесь, что новое соединение с SQLite получает PRAGMA из настроек.'
@@ -0,0 +1,34 @@
+import pytest
+from django.test import override_settings
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@override_settings(BLOG_STREAMING_LIST_PAGES=True)
+@pytest.mark.parametrize(
+    'get_url',
+    [
+        lambda post: '/',
+        lambda post: f'/category/{post.category.slug}/',
+        lambda post: f'/profile/{post.author.username}/',
+    ],
+    ids=['index', 'category', 'profile'],
+)
+def test_list_pages_stream(
+        user_client, many_posts_with_published_locations, get_url
+):
+    posts = many_posts_with_published_locations
+    response = user_client.get(get_url(posts[0]))
+    assert response.streaming, (
+        'Убедитесь, что в потоковом режиме страница отдаётся'
+        ' StreamingHttpResponse.'
+    )
+    chunks = [chunk.decode('utf-8') for chunk in response.streaming_content]
+    assert '<header>' in chunks[0]
+    assert '</html>' in chunks[-1]
+    cards = [chunk for chunk in chunks[1:-1] if 'card-title' in chunk]
+    assert len(cards) == N_PER_PAGE, (
+        'Убедитесь, что карточки публикаций отдаются отдельными частями.'
+    )
@@ -0,0 +1,80 @@
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def feed_urls(post_with_published_location):
+    post = post_with_published_location
+    return [
+        '/feeds/rss/',
+        '/feeds/atom/',
+        f'/category/{post.category.slug}/rss/',
+        f'/category/{post.category.slug}/atom/',
+        f'/profile/{post.author.username}/rss/',
+        f'/profile/{post.author.username}/atom/',
+    ]
+
+
+def test_feeds_list_published_posts(
+        client, feed_urls, post_with_published_location, future_posts,
+        unpublished_posts_with_published_locations):
+    post = post_with_published_location
+    for url in feed_urls:
+        response = client.get(url)
+        assert response.status_code == 200, url
+        assert response['Content-Type'].startswith(
+            'application/atom+xml' if 'atom' in url else 'application/rss+xml'
+        ), url
+        content = response.content.decode()
+        assert f'/posts/{post.id}/' in content, (
+            f'Убедитесь, что лента {url} содержит опубликованные записи.'
+        )
+        for hidden in (future_posts[0],
+                       unpublished_posts_with_published_locations[0]):
+            assert f'/posts/{hidden.id}/' not in content, (
+                f'Убедитесь, что лента {url} не содержит отложенных и снятых '
+                'с публикации записей.'
+            )
+
+
+def test_feed_not_found(client, posts_with_unpublished_category):
+    category = posts_with_unpublished_category[0].category
+    assert client.get(f'/category/{category.slug}/rss/').status_code == 404
+    assert client.get('/profile/nobody/atom/').status_code == 404
+
+
+def test_feed_conditional_get(client, feed_urls, settled_changes):
+    response = client.get(feed_urls[0])
+    assert response.has_header('ETag')
+    assert response.has_header('Last-Modified')
+    response = client.get(
+        feed_urls[0], HTTP_IF_NONE_MATCH=response['ETag']
+    )
+    assert response.status_code == 304, (
+        'Убедитесь, что ленты отвечают 304, пока публикации не менялись.'
+    )
+
+
+@override_settings(BLOG_PAGE_CACHE_TIMEOUT=60)
+def test_feed_rebuilt_when_post_changes(client, feed_urls, user):
+    url = feed_urls[0]
+    first = client.get(url)
+    with CaptureQueriesContext(connection) as queries:
+        assert client.get(url).content == first.content
+    assert len(queries) == 1, (
+        'Убедитесь, что готовая лента берётся из кеша: без изменений '
+        'публикаций выполняется только запрос даты последней публикации.'
+    )
+
+    post = Post.objects.get()
+    post.title = 'Новый заголовок'
+    post.save()
+    assert 'Новый заголовок' in client.get(url).content.decode(), (
+        'Убедитесь, что лента пересобирается после изменения публикации.'
+    )